@@ -82,6 +82,38 @@ def load_csv(filepath):
         st.error(f"Error loading CSV from {filepath}: {e}")
         return None
 
+def newest_mtime(path):
+    """Latest modification time of a file, or of any file under a directory (0 if missing)"""
+    path = Path(path)
+    if path.is_dir():
+        return max((f.stat().st_mtime for f in path.rglob('*') if f.is_file()), default=0)
+    return path.stat().st_mtime if path.exists() else 0
+
+def load_cities_data(csv_path="cities_comparison.csv", parquet_root="cities_comparison_parquet"):
+    """Load combined city data from the partitioned Parquet store or the CSV, whichever is newer"""
+    if Path(parquet_root).is_dir() and newest_mtime(parquet_root) >= newest_mtime(csv_path):
+        try:
+            from examples_py.parquet_store import read_parquet_dataset
+            return read_parquet_dataset(parquet_root)
+        except ImportError:
+            pass
+        except Exception as e:
+            st.error(f"Error loading Parquet dataset from {parquet_root}: {e}")
+    return load_csv(csv_path)
+
+def load_hourly_table(path="normalized_hourly.arrow"):
+    """Open the flat hourly table (per-day slicing) if it exists"""
+    if not Path(path).exists():
+        return None
+    try:
+        from examples_py.hourly_table import open_hourly_table
+        return open_hourly_table(path)
+    except ImportError:
+        return None
+    except Exception as e:
+        st.error(f"Error loading hourly table from {path}: {e}")
+        return None
+
 def file_exists(filepath):
     """Check if file exists"""
     return Path(filepath).exists()
@@ -185,9 +217,9 @@ def show_home():
         files_status = {
             "Task A": file_exists("table_data.csv"),
             "Task B": file_exists("weekly_summary.json"),
-            "Task C": file_exists("cities_comparison.csv"),
+            "Task C": file_exists("cities_comparison.csv") or file_exists("cities_comparison_parquet"),
             "Task D": file_exists("imputation_report_buggy.json"),
-            "Task E": file_exists("normalized_hourly.json"),
+            "Task E": file_exists("normalized_hourly.json") or file_exists("normalized_hourly.arrow"),
             "Task F": file_exists("extracted_weather_data_buggy.csv")
         }
         
@@ -446,7 +478,7 @@ def show_task_c():
     """)
     
     # Load data
-    df = load_csv("cities_comparison.csv")
+    df = load_cities_data()
     df_fixed = load_csv("cities_comparison_fixed.csv")
     
     if df is not None or df_fixed is not None:
@@ -746,15 +778,23 @@ def show_task_e():
     """)
     
     # Load data
-    hourly_data = load_json("normalized_hourly.json")
+    # example5 writes only the JSON: use the flat table only if it is not older
+    hourly_table = None
+    if newest_mtime("normalized_hourly.arrow") >= newest_mtime("normalized_hourly.json"):
+        hourly_table = load_hourly_table("normalized_hourly.arrow")
+    hourly_data = load_json("normalized_hourly.json") if hourly_table is None else None
     peak_hours = load_csv("peak_hours.csv")
     
-    if hourly_data:
+    if hourly_table is not None or hourly_data:
         # Summary metrics
         st.markdown("### 📊 Parsing Summary")
         
-        total_days = len(hourly_data)
-        total_hours = sum(len(day.get('hourly', [])) for day in hourly_data)
+        if hourly_table is not None:
+            total_days = len(hourly_table.dates)
+            total_hours = len(hourly_table)
+        else:
+            total_days = len(hourly_data)
+            total_hours = sum(len(day.get('hourly', [])) for day in hourly_data)
         avg_hours = total_hours / total_days if total_days > 0 else 0
         
         col1, col2, col3 = st.columns(3)
@@ -771,14 +811,20 @@ def show_task_e():
         st.subheader("🕐 Hourly Weather Data")
         
         # Day selector
-        dates = [day['date'] for day in hourly_data]
+        if hourly_table is not None:
+            dates = hourly_table.dates
+        else:
+            dates = [day['date'] for day in hourly_data]
         selected_date = st.selectbox("Select Date:", dates)
         
-        # Find selected day data
-        selected_day = next((day for day in hourly_data if day['date'] == selected_date), None)
+        # Find selected day data (the flat table slices only the selected day)
+        if hourly_table is not None:
+            hourly_df = hourly_table.day_frame(selected_date).drop(columns=['date'])
+        else:
+            selected_day = next((day for day in hourly_data if day['date'] == selected_date), None)
+            hourly_df = pd.DataFrame(selected_day['hourly']) if selected_day and selected_day.get('hourly') else None
         
-        if selected_day and selected_day.get('hourly'):
-            hourly_df = pd.DataFrame(selected_day['hourly'])
+        if hourly_df is not None and not hourly_df.empty:
             
             col1, col2 = st.columns([1, 2])
             
@@ -871,7 +917,7 @@ def show_task_e():
         ```
         """)
     
-    if not hourly_data and not peak_hours:
+    if hourly_table is None and not hourly_data and peak_hours is None:
         st.warning("⚠️ No data found. Please run `examples_py/example5.py` to generate the output files.")
         st.info("Run: `python examples_py/example5.py`")
 
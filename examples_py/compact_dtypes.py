@@ -0,0 +1,207 @@
+# compact_dtypes.py - Memory-Compact Dtypes for the Combined Weather Frame
+"""
+Shrink the combined weather DataFrame (city, date, max, min, precip, wind, humidity).
+
+    city      object  -> category
+    date      object  -> datetime64[s]  (or Int32 days since 1970-01-01)
+    max/min/precip/wind float64 -> float32
+    humidity  float64 -> UInt8 (nullable), float32 if values are not whole percents
+
+`expand_weather_frame` restores the original representation, and
+`verify_round_trip` checks that compaction changed nothing beyond float32 precision.
+Dates that are not valid YYYY-MM-DD (e.g. New York's swapped '2024-15-08')
+cannot be stored in a date column: they are counted, reported, and kept in
+`df.attrs['invalid_dates']`, or rejected with invalid_dates='raise'.
+"""
+
+import numpy as np
+import pandas as pd
+
+MEASUREMENT_COLUMNS = ['max', 'min', 'precip', 'wind']
+EPOCH = pd.Timestamp('1970-01-01')
+
+
+def compact_weather_frame(df, date_format='datetime64', invalid_dates='warn'):
+    """
+    Return a compacted copy of the combined weather frame.
+
+    date_format: 'datetime64' (datetime64[s]) or 'daynum' (Int32 days since epoch)
+    invalid_dates: 'warn' (store as NaT/<NA> and report) or 'raise' (ValueError)
+    """
+    if date_format not in ('datetime64', 'daynum'):
+        raise ValueError(f"Unknown date_format: {date_format}")
+    if invalid_dates not in ('warn', 'raise'):
+        raise ValueError(f"Unknown invalid_dates: {invalid_dates}")
+
+    out = pd.DataFrame(index=df.index)
+
+    for col in df.columns:
+        series = df[col]
+
+        if col == 'city':
+            out[col] = series.astype('category')
+
+        elif col == 'date':
+            dates = pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
+            invalid = dates.isna() & series.notna()
+            if invalid.any():
+                examples = series[invalid].unique()[:3].tolist()
+                message = f"{int(invalid.sum())} rows with invalid dates (e.g. {examples})"
+                if invalid_dates == 'raise':
+                    raise ValueError(message)
+                print(f"⚠️ {message} stored as missing dates")
+            out.attrs['invalid_dates'] = int(invalid.sum())
+            if date_format == 'datetime64':
+                out[col] = dates.astype('datetime64[s]')
+            else:
+                out[col] = (dates - EPOCH).dt.days.astype('Int32')
+
+        elif col in MEASUREMENT_COLUMNS:
+            out[col] = pd.to_numeric(series, errors='coerce').astype(np.float32)
+
+        elif col == 'humidity':
+            values = pd.to_numeric(series, errors='coerce')
+            valid = values.dropna()
+            whole = (valid == np.round(valid)).all()
+            in_range = ((valid >= 0) & (valid <= 255)).all()
+            if whole and in_range:
+                out[col] = values.astype('UInt8')
+            else:
+                # Fractional or out-of-range humidity would be altered by UInt8
+                print("⚠️ humidity has non-integer values, storing as float32")
+                out[col] = values.astype(np.float32)
+
+        else:
+            out[col] = series
+
+    return out
+
+
+def expand_weather_frame(df):
+    """Convert a compacted frame back to the original object/float64 representation"""
+    out = pd.DataFrame(index=df.index)
+
+    for col in df.columns:
+        series = df[col]
+
+        if col == 'city':
+            out[col] = series.astype(object)
+
+        elif col == 'date':
+            if pd.api.types.is_integer_dtype(series.dtype):
+                series = EPOCH + pd.to_timedelta(series.astype('float64'), unit='D')
+            formatted = pd.to_datetime(series).dt.strftime('%Y-%m-%d')
+            out[col] = formatted.astype(object).where(formatted.notna(), None)
+
+        elif col in MEASUREMENT_COLUMNS or col == 'humidity':
+            out[col] = series.astype('float64')
+
+        else:
+            out[col] = series
+
+    return out
+
+
+def memory_report(df, compact=None):
+    """
+    Per-column memory usage in bytes (deep, i.e. including Python string objects).
+
+    If `compact` is given, the report compares `df` against it.
+    Returns: DataFrame indexed by column
+    """
+    before = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': before})
+
+    if compact is not None:
+        after = compact.memory_usage(deep=True, index=False)
+        report['compact_dtype'] = compact.dtypes.astype(str)
+        report['compact_bytes'] = after
+        report['ratio'] = (report['bytes'] / report['compact_bytes']).round(2)
+
+    total = report[[c for c in report.columns if c.endswith('bytes')]].sum()
+    report.loc['TOTAL'] = total
+    return report
+
+
+def verify_round_trip(original, compact):
+    """
+    Check that `compact` holds the same values as `original`.
+
+    Non-numeric columns must match exactly; float columns may differ only by
+    float32 rounding (relative tolerance of float32 eps).
+    Returns: dict column -> max absolute difference
+    Raises: ValueError on any mismatch
+    """
+    restored = expand_weather_frame(compact)
+    diffs = {}
+
+    for col in original.columns:
+        if col in MEASUREMENT_COLUMNS or col == 'humidity':
+            a = pd.to_numeric(original[col], errors='coerce').to_numpy(dtype='float64')
+            b = restored[col].to_numpy(dtype='float64')
+            if not np.array_equal(np.isnan(a), np.isnan(b)):
+                raise ValueError(f"Missing values changed in column '{col}'")
+            mask = ~np.isnan(a)
+            eps = np.finfo(np.float32).eps
+            if not np.allclose(a[mask], b[mask], rtol=eps, atol=0):
+                raise ValueError(f"Values in column '{col}' changed beyond float32 precision")
+            diffs[col] = float(np.max(np.abs(a[mask] - b[mask]))) if mask.any() else 0.0
+        else:
+            # Missing values compare as None whatever the dtype (None, nan, NaT, <NA>)
+            a = [None if pd.isna(v) else v for v in original[col].tolist()]
+            b = [None if pd.isna(v) else v for v in restored[col].tolist()]
+            if a != b:
+                raise ValueError(f"Values in column '{col}' changed")
+            diffs[col] = 0.0
+
+    return diffs
+
+
+def check_round_trip():
+    """
+    Compact and expand a frame with missing values and float32 edge cases
+    in both date formats. Returns: number of frames checked
+    """
+    f32 = np.finfo(np.float32)
+    original = pd.DataFrame({
+        'city': ['Tokyo', 'London', None, 'Tokyo', 'New York'],
+        'date': ['2024-08-18', None, '1969-12-31', '2038-01-20', '2024-02-29'],
+        'max': [31.2, np.nan, float(f32.max), -0.0, 0.1],
+        'min': [24.5, -40.0, float(f32.tiny), np.nan, 1e-7],
+        'precip': [0.0, np.nan, 123.456, 1e30, 2.5],
+        'wind': [np.nan, 3.3, float(-f32.max), 7.0, 0.0],
+        'humidity': [65.0, None, 0.0, 100.0, np.nan],
+    })
+    checked = 0
+    for date_format in ('datetime64', 'daynum'):
+        compact = compact_weather_frame(original, date_format=date_format)
+        assert str(compact['humidity'].dtype) == 'UInt8'
+        assert compact.attrs['invalid_dates'] == 0
+        verify_round_trip(original, compact)
+        checked += 1
+
+    # Fractional humidity falls back to float32 and must survive as well
+    fractional = original.assign(humidity=[65.5, None, 0.25, 100.0, np.nan])
+    verify_round_trip(fractional, compact_weather_frame(fractional))
+    checked += 1
+
+    # Unparseable dates are counted (and rejected on request), not silently dropped
+    swapped = original.assign(date=['2024-15-08', None, '2024-08-18', 'not a date', '2024-02-29'])
+    assert compact_weather_frame(swapped).attrs['invalid_dates'] == 2
+    try:
+        compact_weather_frame(swapped, invalid_dates='raise')
+    except ValueError:
+        checked += 1
+    else:
+        raise AssertionError("invalid dates were accepted with invalid_dates='raise'")
+    return checked
+
+
+if __name__ == "__main__":
+    print(f"✅ {check_round_trip()} round-trip checks passed")
+
+    import os
+    if os.path.exists('tokyo_weather.json'):
+        from examples_py.normalize_all import load_and_normalize_all_cities
+        df = load_and_normalize_all_cities()
+        print(memory_report(df, compact_weather_frame(df)))
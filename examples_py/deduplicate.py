@@ -0,0 +1,108 @@
+# deduplicate.py - Hash-Indexed Deduplication of (city, date) Records
+"""
+Single-pass deduplication of normalized weather records.
+
+Overlapping station files (re-issued forecasts, backfills) produce several
+rows for the same (city, date). A dict keyed by (city, date) holds the
+currently winning row; each incoming row is resolved against it in O(1).
+
+Conflict resolution strategies:
+    'last'         - the most recently seen row wins
+    'priority'     - the row from the higher-priority source wins (ties: last wins)
+    'completeness' - the row with more non-missing measurements wins (ties: last wins)
+"""
+
+KEY_FIELDS = ('city', 'date')
+MEASUREMENT_FIELDS = ('max', 'min', 'precip', 'wind', 'humidity')
+STRATEGIES = ('last', 'priority', 'completeness')
+
+
+def _is_missing(value):
+    # NaN is the only value not equal to itself
+    return value is None or value != value
+
+
+def completeness(record, fields=MEASUREMENT_FIELDS):
+    """Number of non-missing measurement fields in a record"""
+    return sum(1 for field in fields if not _is_missing(record.get(field)))
+
+
+def deduplicate_records(tagged_records, strategy='last', source_priority=None,
+                        key_fields=KEY_FIELDS):
+    """
+    Deduplicate a stream of (source, record) pairs in one pass.
+
+    tagged_records  - iterable of (source_name, record_dict), consumed once
+    strategy        - 'last', 'priority' or 'completeness'
+    source_priority - list of source names, highest priority first
+                      (required for 'priority'; unknown sources rank lowest)
+    Returns: (list of unique records in first-seen key order, stats dict)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}. Use one of {STRATEGIES}")
+    if strategy == 'priority' and not source_priority:
+        raise ValueError("strategy='priority' requires source_priority")
+
+    rank_of = {}
+    if source_priority:
+        # Higher number = higher priority
+        n = len(source_priority)
+        rank_of = {source: n - i for i, source in enumerate(source_priority)}
+
+    def score(source, record):
+        if strategy == 'priority':
+            return rank_of.get(source, 0)
+        if strategy == 'completeness':
+            return completeness(record)
+        return 0
+
+    index = {}  # key -> (score, record)
+    stats = {'input_rows': 0, 'duplicates': 0, 'replaced': 0, 'kept_existing': 0}
+
+    for source, record in tagged_records:
+        stats['input_rows'] += 1
+        key = tuple(record.get(field) for field in key_fields)
+        new_score = score(source, record)
+
+        current = index.get(key)
+        if current is None:
+            index[key] = (new_score, record)
+            continue
+
+        stats['duplicates'] += 1
+        # >= so that ties go to the later row
+        if new_score >= current[0]:
+            index[key] = (new_score, record)
+            stats['replaced'] += 1
+        else:
+            stats['kept_existing'] += 1
+
+    unique = [record for _, record in index.values()]
+    stats['unique_rows'] = len(unique)
+    return unique, stats
+
+
+def tag_sources(named_streams):
+    """
+    Turn {source_name: records} (or a list of (name, records) pairs) into one
+    lazy stream of (source_name, record) pairs, in source order.
+    """
+    items = named_streams.items() if isinstance(named_streams, dict) else named_streams
+    for source, records in items:
+        for record in records:
+            yield source, record
+
+
+def deduplicate_normalized_lists(normalized_data_list, strategy='last', source_priority=None):
+    """
+    Deduplicate the per-city lists passed to combine_normalized_data.
+
+    Sources are named by their position in the list ('0', '1', ...) unless
+    `normalized_data_list` is a dict of name -> records.
+    """
+    if isinstance(normalized_data_list, dict):
+        named = normalized_data_list
+    else:
+        named = [(str(i), records) for i, records in enumerate(normalized_data_list)]
+    return deduplicate_records(tag_sources(named), strategy=strategy,
+                               source_priority=source_priority)
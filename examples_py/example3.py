@@ -194,10 +194,36 @@ def normalize_london_data(data):
     
     return normalized
 
-def combine_normalized_data(normalized_data_list):
+def combine_normalized_data(normalized_data_list, merge_sorted=False,
+                            dedupe=None, source_priority=None):
     """
     Combine normalized data from multiple cities into single structure
+    merge_sorted: k-way merge of the date-ordered city lists into
+                  (date, city) order; raises ValueError if a city list is
+                  not date-ordered (see merge_streams.py)
+    dedupe: None or a conflict strategy ('last', 'priority', 'completeness')
+            for duplicate (city, date) rows (see deduplicate.py)
+    source_priority: source names, highest priority first (dedupe='priority');
+                     sources are '0', '1', ... unless a dict of name -> records is passed
     """
+    if dedupe:
+        from examples_py.deduplicate import deduplicate_normalized_lists
+        unique, stats = deduplicate_normalized_lists(normalized_data_list, strategy=dedupe,
+                                                     source_priority=source_priority)
+        print(f"🔁 Dedup ({dedupe}): {stats['duplicates']} duplicates, "
+              f"{stats['replaced']} rows replaced")
+        # Keep the winning rows in their source lists, so combining (and merging) is unchanged
+        winners = {id(record) for record in unique}
+        lists = normalized_data_list.values() if isinstance(normalized_data_list, dict) else normalized_data_list
+        normalized_data_list = [[record for record in city_data if id(record) in winners]
+                                for city_data in lists]
+    elif isinstance(normalized_data_list, dict):
+        normalized_data_list = list(normalized_data_list.values())
+
+    if merge_sorted:
+        from examples_py.merge_streams import merge_sorted_streams
+        return list(merge_sorted_streams(normalized_data_list, check_order=True))
+
     combined = []
     for city_data in normalized_data_list:
         combined.extend(city_data)
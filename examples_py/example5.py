@@ -176,6 +176,21 @@ def save_results_buggy(normalized_data, peak_hours):
     
     print("Results saved to normalized_hourly_buggy.json and peak_hours_buggy.csv")
 
+def save_hourly_table(filename='hourly_weather.xml', output='normalized_hourly.arrow'):
+    """
+    Stream the XML into the flat hourly table the app reads (see hourly_table.py);
+    days are converted batch by batch with the streaming parser
+    """
+    try:
+        from examples_py.hourly_table import write_hourly_table
+        from examples_py.xml_streaming import iter_days
+        n_days, n_rows = write_hourly_table(iter_days(filename), output)
+    except ImportError as e:
+        print(f"Skipping {output}: {e}")
+        return None
+    print(f"Hourly table saved to {output} ({n_days} days, {n_rows} hours)")
+    return output
+
 def main_xml_parsing_buggy():
     """Main function for XML parsing (buggy version)"""
     print("=== Task E: Parse Hourly Weather XML (BUGGY VERSION) ===")
@@ -186,6 +201,7 @@ def main_xml_parsing_buggy():
     # Parse XML
     print("Parsing XML file...")
     normalized_data = parse_xml_buggy('hourly_weather.xml')
+    save_hourly_table('hourly_weather.xml')
     
     if not normalized_data:
         print("Failed to parse XML")
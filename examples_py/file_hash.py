@@ -0,0 +1,17 @@
+# file_hash.py - Content Hashing of Input Files
+"""
+Chunked SHA-256 of a file, shared by the change-tracking modules
+(incremental_normalization, xml_cache). Standard library only, so importing
+it does not pull in pandas or the normalizers.
+"""
+
+import hashlib
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
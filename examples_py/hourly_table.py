@@ -0,0 +1,342 @@
+# hourly_table.py - Flat Columnar Hourly Table with a Per-Date Row Index
+"""
+Flat, typed alternative to the nested normalized_hourly.json of Task E.
+
+One row per hour:
+
+    date         timestamp[s] (datetime64 in pandas)
+    minutes      uint16        minutes since midnight ('06:30' -> 390)
+    temperature  float32
+    wind_speed   float32
+
+Rows of a day are contiguous, and a day index (dates + row offsets, day i is
+rows offsets[i]:offsets[i+1]) is stored with the data. A consumer can
+therefore slice one day without touching the rest:
+
+    table = open_hourly_table('normalized_hourly.arrow')   # memory-mapped
+    table.day_frame('2024-08-18')
+
+A date that occurs on several day records (e.g. two <day> elements with the
+same date) selects all of their rows; day_at(i) reaches a single record.
+Undated days are looked up with None.
+
+write_hourly_table() converts day records (e.g. straight from iter_days)
+batch by batch, so only about row_group_size rows are held in memory. In
+Arrow IPC files (.arrow) each record batch carries the index of its own days
+in its custom metadata; Parquet files (.parquet) get the index in the footer
+key/value metadata. Tables built in memory (days_to_table) keep it in the
+schema metadata, which open_hourly_table also reads.
+
+Arrow IPC files are memory-mapped and sliced zero-copy; Parquet files read
+only the row groups that overlap the requested day.
+Requires pyarrow.
+"""
+
+import json
+from array import array
+
+import numpy as np
+import pandas as pd
+
+INDEX_KEY = b'day_index'
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+def _pa():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("The hourly table requires pyarrow: pip install pyarrow") from None
+    return pa
+
+
+def hourly_schema():
+    pa = _pa()
+    return pa.schema([
+        ('date', pa.timestamp('s')),
+        ('minutes', pa.uint16()),
+        ('temperature', pa.float32()),
+        ('wind_speed', pa.float32()),
+    ])
+
+
+def time_to_minutes(value):
+    """'HH:MM' -> minutes since midnight, None if the time is missing or invalid"""
+    try:
+        hours, minutes = str(value).split(':')[:2]
+        total = int(hours) * 60 + int(minutes)
+    except (TypeError, ValueError):
+        return None
+    return total if 0 <= total < 24 * 60 else None
+
+
+def minutes_to_time(minutes):
+    """Minutes since midnight (array) -> 'HH:MM' strings, None for nulls"""
+    return [None if m is None or pd.isna(m) else f"{int(m) // 60:02d}:{int(m) % 60:02d}"
+            for m in minutes]
+
+
+def _days_to_batch(days):
+    """Flatten a list of day records. Returns: (RecordBatch, dates, row offsets)"""
+    pa = _pa()
+    dates, offsets = [], array('q', [0])
+    row_dates, minutes, temps, winds = [], [], [], []
+
+    for day in days:
+        hourly = day.get('hourly') or []
+        dates.append(day['date'])
+        for hour in hourly:
+            row_dates.append(day['date'])
+            minutes.append(time_to_minutes(hour.get('time')))
+            temps.append(hour.get('temperature'))
+            winds.append(hour.get('wind_speed'))
+        offsets.append(len(row_dates))
+
+    row_ts = pd.to_datetime(pd.Series(row_dates, dtype=object), errors='coerce').to_numpy('datetime64[s]')
+    batch = pa.record_batch([
+        pa.array(row_ts, type=pa.timestamp('s'), from_pandas=True),
+        pa.array(minutes, type=pa.uint16()),
+        pa.array(temps, type=pa.float32(), from_pandas=True),
+        pa.array(winds, type=pa.float32(), from_pandas=True),
+    ], schema=hourly_schema())
+    return batch, dates, np.frombuffer(offsets, dtype=np.int64)
+
+
+def iter_day_batches(days, batch_rows=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Flatten day records (any iterable, e.g. iter_days) into record batches.
+    A batch is closed at the first day boundary after batch_rows rows, so a
+    day never spans two batches.
+    Yields: (RecordBatch, dates of its days, row offsets within the batch)
+    """
+    pending, rows = [], 0
+    for day in days:
+        pending.append(day)
+        rows += len(day.get('hourly') or [])
+        if rows >= batch_rows:
+            yield _days_to_batch(pending)
+            pending, rows = [], 0
+    if pending:
+        yield _days_to_batch(pending)
+
+
+def days_to_table(days):
+    """
+    Flatten day records ({'date', 'hourly': [{'time', 'temperature', 'wind_speed'}]},
+    as produced by parse_xml_streaming / iter_days) into an Arrow table.
+    Days keep their input order; days without hours get an empty index range.
+    Returns: pyarrow.Table with the day index in its schema metadata
+    """
+    pa = _pa()
+    batches, dates, offsets = [], [], [np.zeros(1, dtype=np.int64)]
+    for batch, batch_dates, batch_offsets in iter_day_batches(days):
+        batches.append(batch)
+        dates.extend(batch_dates)
+        offsets.append(offsets[-1][-1] + batch_offsets[1:])
+    table = pa.Table.from_batches(batches, schema=hourly_schema())
+    return attach_day_index(table, dates, np.concatenate(offsets))
+
+
+def _encode_index(dates, offsets):
+    return json.dumps({'dates': [str(d) if d is not None else None for d in dates],
+                       'offsets': [int(o) for o in offsets]}).encode()
+
+
+def _decode_index(raw):
+    index = json.loads(raw)
+    return index['dates'], np.asarray(index['offsets'], dtype=np.int64)
+
+
+def attach_day_index(table, dates, offsets):
+    """Store dates and row offsets (len(dates) + 1) in the table's schema metadata"""
+    metadata = dict(table.schema.metadata or {})
+    metadata[INDEX_KEY] = _encode_index(dates, offsets)
+    return table.replace_schema_metadata(metadata)
+
+
+def read_day_index(schema):
+    """Schema metadata -> (list of dates, int64 offsets array)"""
+    raw = (schema.metadata or {}).get(INDEX_KEY)
+    if raw is None:
+        raise ValueError("No day index in the table metadata")
+    return _decode_index(raw)
+
+
+def write_hourly_table(data, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Write day records (any iterable, converted batch by batch) or a table from
+    days_to_table as Arrow IPC (.arrow/.feather) or Parquet (.parquet).
+    Batches / row groups hold about row_group_size rows, rounded up to whole days.
+    Returns: (number of days, number of hourly rows)
+    """
+    pa = _pa()
+    parquet = str(path).endswith('.parquet')
+    if isinstance(data, pa.Table):
+        if parquet:
+            import pyarrow.parquet as pq
+            pq.write_table(data, path, row_group_size=row_group_size)
+        else:
+            import pyarrow.ipc as ipc
+            with pa.OSFile(str(path), 'wb') as sink, ipc.new_file(sink, data.schema) as writer:
+                writer.write_table(data)
+        return len(read_day_index(data.schema)[0]), data.num_rows
+
+    n_days = n_rows = 0
+    if parquet:
+        import pyarrow.parquet as pq
+        dates, offsets = [], [np.zeros(1, dtype=np.int64)]
+        with pq.ParquetWriter(str(path), hourly_schema()) as writer:
+            for batch, batch_dates, batch_offsets in iter_day_batches(data, row_group_size):
+                writer.write_batch(batch)
+                dates.extend(batch_dates)
+                offsets.append(offsets[-1][-1] + batch_offsets[1:])
+            writer.add_key_value_metadata({INDEX_KEY: _encode_index(dates, np.concatenate(offsets))})
+        return len(dates), int(offsets[-1][-1])
+
+    import pyarrow.ipc as ipc
+    with pa.OSFile(str(path), 'wb') as sink, ipc.new_file(sink, hourly_schema()) as writer:
+        for batch, batch_dates, batch_offsets in iter_day_batches(data, row_group_size):
+            writer.write_batch(batch, custom_metadata={INDEX_KEY: _encode_index(batch_dates, batch_offsets)})
+            n_days += len(batch_dates)
+            n_rows += batch.num_rows
+    return n_days, n_rows
+
+
+class HourlyTable:
+    """Opened hourly table: day index plus per-day slicing"""
+
+    def __init__(self, path):
+        pa = _pa()
+        self.path = str(path)
+        self.parquet = self.path.endswith('.parquet')
+
+        if self.parquet:
+            import pyarrow.parquet as pq
+            self._file = pq.ParquetFile(self.path)
+            sizes = [self._file.metadata.row_group(i).num_rows
+                     for i in range(self._file.metadata.num_row_groups)]
+            self._group_starts = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+            self._table = None
+            # Streamed files keep the index in the footer, tables in the schema
+            raw = (self._file.metadata.metadata or {}).get(INDEX_KEY)
+            if raw is not None:
+                self.dates, self.offsets = _decode_index(raw)
+            else:
+                self.dates, self.offsets = read_day_index(self._file.schema_arrow)
+        else:
+            import pyarrow.ipc as ipc
+            reader = ipc.open_file(pa.memory_map(self.path, 'r'))
+            if INDEX_KEY in (reader.schema.metadata or {}):
+                self._table = reader.read_all()
+                self.dates, self.offsets = read_day_index(reader.schema)
+            else:
+                # Streamed file: every batch indexes its own days
+                batches, dates, offsets = [], [], [np.zeros(1, dtype=np.int64)]
+                for i in range(reader.num_record_batches):
+                    batch, metadata = reader.get_batch_with_custom_metadata(i)
+                    if metadata is None or INDEX_KEY not in metadata:
+                        raise ValueError(f"No day index in record batch {i} of {self.path}")
+                    batch_dates, batch_offsets = _decode_index(metadata[INDEX_KEY])
+                    batches.append(batch)
+                    dates.extend(batch_dates)
+                    offsets.append(offsets[-1][-1] + batch_offsets[1:])
+                self._table = pa.Table.from_batches(batches, schema=reader.schema)
+                self.dates, self.offsets = dates, np.concatenate(offsets)
+
+        self._positions = {}     # date -> indices of its day records
+        for i, d in enumerate(self.dates):
+            self._positions.setdefault(d, []).append(i)
+
+    def __len__(self):
+        """Number of hourly rows"""
+        return int(self.offsets[-1])
+
+    def hours_per_day(self):
+        return pd.Series(np.diff(self.offsets), index=self.dates, name='hours')
+
+    def day_ranges(self, date):
+        """Row ranges [(start, stop), ...] of every day record with this date; KeyError if absent"""
+        key = None if date is None else str(date)
+        return [(int(self.offsets[i]), int(self.offsets[i + 1])) for i in self._positions[key]]
+
+    def day_range(self, date):
+        """Row range (start, stop) of a date; ValueError if it occurs on several day records"""
+        ranges = self.day_ranges(date)
+        if len(ranges) > 1:
+            raise ValueError(f"Date {date} occurs on {len(ranges)} day records; use day_ranges() or day_at()")
+        return ranges[0]
+
+    def day(self, date):
+        """Arrow table with the rows of one date, from every day record that has it"""
+        parts = [self._rows(start, stop) for start, stop in self.day_ranges(date)]
+        if len(parts) == 1:
+            return parts[0]
+        return _pa().concat_tables(parts)
+
+    def day_at(self, i):
+        """Arrow table with the rows of the i-th day record"""
+        return self._rows(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def _rows(self, start, stop):
+        """Rows [start, stop) (zero-copy slice for Arrow IPC)"""
+        if not self.parquet:
+            return self._table.slice(start, stop - start)
+
+        if stop == start:
+            return hourly_schema().empty_table()
+        first = int(np.searchsorted(self._group_starts, start, side='right')) - 1
+        last = int(np.searchsorted(self._group_starts, stop - 1, side='right')) - 1
+        part = self._file.read_row_groups(list(range(first, last + 1)))
+        offset = start - int(self._group_starts[first])
+        # Parquet has no second resolution; restore timestamp[s] on read
+        return part.slice(offset, stop - start).cast(hourly_schema())
+
+    def day_frame(self, date):
+        """One date as a DataFrame with 'time' ('HH:MM'), temperature and wind_speed"""
+        df = self.day(date).to_pandas()
+        df.insert(1, 'time', minutes_to_time(df.pop('minutes')))
+        return df
+
+    def to_pandas(self):
+        """Whole table (reads every row)"""
+        table = self._table if not self.parquet else self._file.read().cast(hourly_schema())
+        return table.to_pandas()
+
+
+def open_hourly_table(path):
+    return HourlyTable(path)
+
+
+def to_nested_days(table):
+    """Flat table -> nested day records (the normalized_hourly.json layout)"""
+    dates, offsets = read_day_index(table.schema)
+    times = minutes_to_time(table.column('minutes').to_pylist())
+    temps = table.column('temperature').to_pylist()
+    winds = table.column('wind_speed').to_pylist()
+    return [
+        {'date': date,
+         'hourly': [{'time': times[r], 'temperature': temps[r], 'wind_speed': winds[r]}
+                    for r in range(offsets[i], offsets[i + 1])]}
+        for i, date in enumerate(dates)
+    ]
+
+
+if __name__ == "__main__":
+    import os
+    from examples_py.xml_streaming import generate_hourly_xml, iter_days
+
+    # Task E output (example5.py writes hourly_weather.xml), else a generated year
+    source = 'hourly_weather.xml'
+    if not os.path.exists(source):
+        source = 'hourly_table_demo.xml'
+        generate_hourly_xml(source, n_days=365)
+
+    for path in ('normalized_hourly.arrow', 'normalized_hourly.parquet'):
+        n_days, n_rows = write_hourly_table(iter_days(source), path)
+        print(f"✅ {path}: {n_days} days, {n_rows} hourly rows from {source}")
+
+    for path in ('normalized_hourly.arrow', 'normalized_hourly.parquet'):
+        opened = open_hourly_table(path)
+        print(f"{path}: {len(opened.dates)} days")
+        if opened.dates:
+            print(opened.day_frame(opened.dates[0]).head())
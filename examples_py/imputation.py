@@ -0,0 +1,473 @@
+# imputation.py - Vectorized Imputation Engine for Task D
+"""
+Vectorized replacements for the Task D imputation helpers in example4.py.
+
+linear_interpolate  - np.interp over the valid points; interior gaps are
+                      interpolated, leading/trailing gaps take the nearest
+                      valid value (backward/forward fill) in the same call.
+moving_average_impute - NaN-aware windowed means for every position at once
+                        from prefix sums of values and counts, O(n). Means use
+                        only the original observations, so the result does not
+                        depend on the order in which gaps are filled.
+time_interpolate      - linear interpolation against real elapsed time
+                        (datetime64) instead of list position; optional
+                        reindexing onto a regular frequency exposes
+                        implicit gaps (missing rows) first.
+impute_weather_table  - loads `weather_data` once into a records x fields
+                        float matrix plus a missing mask, applies a strategy
+                        per column and counts filled cells from the mask.
+
+All functions accept lists with None or float arrays with NaN and return
+float64 NumPy arrays (NaN where nothing could be filled).
+"""
+
+import ast
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+WEATHER_FIELDS = ['temp_max', 'temp_min', 'humidity', 'wind_speed']
+
+# Task D defaults: linear for temperatures, moving average for humidity/wind
+DEFAULT_STRATEGIES = {
+    'temp_max': 'linear',
+    'temp_min': 'linear',
+    'humidity': ('moving_average', {'fallback': 'linear'}),
+    'wind_speed': ('moving_average', {'fallback': 'linear'}),
+}
+
+
+def to_float_array(values):
+    """Convert a list with None (or any array-like) to a float64 array with NaN"""
+    return np.asarray(values, dtype=float) if values is not None else np.array([], dtype=float)
+
+
+def linear_interpolate(values, min_valid=2):
+    """
+    Linear interpolation by position, O(n).
+
+    Interior gaps: straight line between the nearest valid neighbours.
+    Edge gaps: nearest valid value (np.interp clamps outside the valid range).
+    min_valid: if fewer valid points exist the series is returned unchanged
+               (2 matches linear_interpolation_buggy; 1 allows constant fill)
+    """
+    arr = to_float_array(values).copy()
+    missing = np.isnan(arr)
+    if not missing.any():
+        return arr
+
+    valid_idx = np.flatnonzero(~missing)
+    if len(valid_idx) < max(min_valid, 1):
+        return arr
+
+    missing_idx = np.flatnonzero(missing)
+    arr[missing_idx] = np.interp(missing_idx, valid_idx, arr[valid_idx])
+    return arr
+
+
+def windowed_mean(values, window=3, center=True, min_periods=1):
+    """
+    NaN-aware rolling mean for every position, O(n) via cumulative sums.
+
+    center=True  - window [i - window//2, i - window//2 + window)
+                   (same alignment as pandas rolling(center=True))
+    center=False - trailing window [i - window + 1, i]
+    Positions with fewer than `min_periods` valid values in the window get NaN.
+    """
+    arr = to_float_array(values)
+    n = len(arr)
+    if n == 0:
+        return arr.copy()
+    window = max(1, min(int(window), n))
+    min_periods = max(1, int(min_periods))
+
+    valid = ~np.isnan(arr)
+    if not valid.any():
+        return np.full(n, np.nan)
+
+    # Shift by the mean so long prefix sums keep their precision
+    offset = arr[valid].mean()
+    shifted = np.where(valid, arr - offset, 0.0)
+    value_sums = np.concatenate(([0.0], np.cumsum(shifted)))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    idx = np.arange(n)
+    start = idx - window // 2 if center else idx - window + 1
+    end = start + window
+    np.clip(start, 0, n, out=start)
+    np.clip(end, 0, n, out=end)
+
+    window_counts = counts[end] - counts[start]
+    window_sums = value_sums[end] - value_sums[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = window_sums / window_counts + offset
+    means[window_counts < min_periods] = np.nan
+    return means
+
+
+def moving_average_impute(values, window=3, center=True, min_periods=1, fallback=None):
+    """
+    Fill missing values with the windowed mean of the original observations.
+
+    window is capped at the series length. Gaps whose window holds fewer than
+    `min_periods` valid values stay NaN unless fallback='linear', in which case
+    they are filled by linear_interpolate.
+    """
+    arr = to_float_array(values).copy()
+    missing = np.isnan(arr)
+    if not missing.any():
+        return arr
+
+    means = windowed_mean(arr, window=window, center=center, min_periods=min_periods)
+    arr[missing] = means[missing]
+
+    if fallback == 'linear':
+        arr = linear_interpolate(arr, min_valid=1)
+    elif fallback is not None:
+        raise ValueError(f"Unknown fallback: {fallback}")
+    return arr
+
+
+def parse_dates(dates):
+    """Parse date strings once into a datetime64[s] array (NaT for invalid)"""
+    return pd.to_datetime(pd.Series(dates), errors='coerce').to_numpy(dtype='datetime64[s]')
+
+
+def time_interpolate(values, times, min_valid=2):
+    """
+    Linear interpolation against elapsed time.
+
+    times: datetime64 array (or date strings) aligned with values; need not be
+           sorted. Rows with NaT times are left unchanged.
+    Edge gaps take the nearest valid value in time, as in linear_interpolate.
+    """
+    arr = to_float_array(values).copy()
+    times = np.asarray(times)
+    if not np.issubdtype(times.dtype, np.datetime64):
+        times = parse_dates(times)
+    if len(times) != len(arr):
+        raise ValueError("values and times must have the same length")
+
+    x = times.astype('datetime64[s]').astype(np.int64).astype(float)
+    has_time = ~np.isnat(times)
+    valid = ~np.isnan(arr) & has_time
+    missing = np.isnan(arr) & has_time
+    if not missing.any() or valid.sum() < max(min_valid, 1):
+        return arr
+
+    order = np.argsort(x[valid], kind='stable')
+    arr[missing] = np.interp(x[missing], x[valid][order], arr[valid][order])
+    return arr
+
+
+def reindex_to_frequency(df, date_col='date', freq='D'):
+    """
+    Reindex a frame onto a regular date range so implicit gaps become NaN rows.
+
+    Dates are parsed once; rows with invalid dates are dropped; duplicate
+    dates raise ValueError (deduplicate first).
+    Returns: new DataFrame with `date_col` as datetime64 and one row per period
+    """
+    times = pd.to_datetime(df[date_col], errors='coerce')
+    frame = df.assign(**{date_col: times}).dropna(subset=[date_col])
+    if frame[date_col].duplicated().any():
+        raise ValueError(f"Duplicate values in '{date_col}', cannot reindex")
+    if frame.empty:
+        return frame
+
+    full = pd.date_range(frame[date_col].min(), frame[date_col].max(), freq=freq)
+    out = frame.set_index(date_col).sort_index().reindex(full)
+    out.index.name = date_col
+    return out.reset_index()
+
+
+def time_impute_frame(df, fields, date_col='date', freq=None, min_valid=2):
+    """
+    Time-aware interpolation of several columns of one series.
+
+    freq: optional pandas frequency ('D', 'h', ...) to reindex onto first.
+    Returns: (DataFrame, counts dict field -> filled cells, including new rows)
+    """
+    frame = reindex_to_frequency(df, date_col, freq) if freq else df.copy()
+    times = frame[date_col].to_numpy()
+    if not np.issubdtype(times.dtype, np.datetime64):
+        times = parse_dates(times)
+
+    counts = {}
+    for field in fields:
+        values = pd.to_numeric(frame[field], errors='coerce').to_numpy(dtype=float)
+        result = time_interpolate(values, times, min_valid=min_valid)
+        counts[field] = int((np.isnan(values) & ~np.isnan(result)).sum())
+        frame[field] = result
+    return frame, counts
+
+
+STRATEGY_FUNCTIONS = {
+    'linear': linear_interpolate,
+    'moving_average': moving_average_impute,
+    'time_linear': time_interpolate,
+}
+
+
+def _resolve_strategy(spec):
+    """'name' or ('name', {kwargs}) -> (function, kwargs)"""
+    name, kwargs = (spec, {}) if isinstance(spec, str) else spec
+    if name not in STRATEGY_FUNCTIONS:
+        raise ValueError(f"Unknown strategy: {name}")
+    return STRATEGY_FUNCTIONS[name], kwargs
+
+
+def records_to_matrix(records, fields=WEATHER_FIELDS):
+    """
+    Read record dicts once into a (records x fields) float64 matrix.
+    Missing keys and None become NaN; the records themselves are not copied.
+    """
+    n = len(records)
+    matrix = np.fromiter(
+        (np.nan if (v := record.get(field)) is None else v
+         for record in records for field in fields),
+        dtype=float, count=n * len(fields)
+    )
+    return matrix.reshape(n, len(fields))
+
+
+def impute_matrix(matrix, fields=WEATHER_FIELDS, strategies=None, times=None):
+    """
+    Impute each column of a (records x fields) matrix with its strategy.
+    times: datetime64 per row, required by the 'time_linear' strategy
+    Returns: (imputed matrix, missing mask of the input)
+    """
+    strategies = DEFAULT_STRATEGIES if strategies is None else strategies
+    missing = np.isnan(matrix)
+    imputed = matrix.copy()
+
+    for j, field in enumerate(fields):
+        if not missing[:, j].any() or field not in strategies:
+            continue
+        func, kwargs = _resolve_strategy(strategies[field])
+        if func is time_interpolate:
+            if times is None:
+                raise ValueError("'time_linear' strategy needs row times")
+            kwargs = dict(kwargs, times=times)
+        imputed[:, j] = func(matrix[:, j], **kwargs)
+
+    return imputed, missing
+
+
+def impute_weather_table(data, fields=WEATHER_FIELDS, strategies=None):
+    """
+    Matrix-based imputation of Task D `weather_data`.
+
+    Returns: (imputed DataFrame with 'date' + fields,
+              counts dict field -> cells that went from missing to filled,
+              missing mask of the input)
+    """
+    records = data.get('weather_data', [])
+    matrix = records_to_matrix(records, fields)
+    dates = [record.get('date') for record in records]
+    specs = (DEFAULT_STRATEGIES if strategies is None else strategies).values()
+    uses_time = any(_resolve_strategy(spec)[0] is time_interpolate for spec in specs)
+    times = parse_dates(dates) if uses_time else None
+    imputed, missing = impute_matrix(matrix, fields, strategies, times=times)
+
+    filled = missing & ~np.isnan(imputed)
+    counts = dict(zip(fields, filled.sum(axis=0).tolist()))
+
+    table = pd.DataFrame(imputed, columns=fields)
+    table.insert(0, 'date', dates)
+    return table, counts, missing
+
+
+# --- Reference implementations from example4.py ---------------------------
+
+def _reference_function(name, extra=(), path=None):
+    """
+    Load a function (plus the helpers it calls, `extra`) from example4.py
+    without executing the module.
+
+    example4.py runs its demo at import time (writes sample files), so only
+    the requested function definitions are compiled.
+    """
+    import json
+
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'example4.py')
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    wanted = {name, *extra}
+    nodes = [node for node in tree.body
+             if isinstance(node, ast.FunctionDef) and node.name in wanted]
+    if name not in {node.name for node in nodes}:
+        raise ValueError(f"{name} not found in {path}")
+    namespace = {'np': np, 'json': json}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), path, 'exec'), namespace)
+    return namespace[name]
+
+
+def _series_with_gaps(n, missing_fraction=0.2, burst_length=1, seed=0):
+    """Sine + noise series with random missing points / bursts of missing points"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    series = 20 + 8 * np.sin(2 * np.pi * t / 24) + rng.normal(0, 1, n)
+    n_bursts = max(1, int(n * missing_fraction / burst_length))
+    starts = rng.integers(0, n, n_bursts)
+    for offset in range(burst_length):
+        series[np.clip(starts + offset, 0, n - 1)] = np.nan
+    return series
+
+
+def check_linear_equivalence(n_series=200, max_length=60, seed=0):
+    """
+    Compare linear_interpolate with linear_interpolation_buggy on random series,
+    including leading/trailing gaps, all-missing and single-valid series.
+    Returns: number of series checked. Raises AssertionError on mismatch.
+    """
+    reference = _reference_function('linear_interpolation_buggy')
+    rng = np.random.default_rng(seed)
+
+    for i in range(n_series):
+        n = int(rng.integers(0, max_length))
+        values = [None if rng.random() < rng.random() else float(v)
+                  for v in rng.normal(20, 5, n)]
+        expected = reference(values)
+        expected = to_float_array([np.nan if v is None else v for v in expected])
+        result = linear_interpolate(values)
+        assert np.allclose(result, expected, equal_nan=True), (
+            f"Mismatch on series {i}: {values}"
+        )
+    return n_series
+
+
+def check_moving_average(n_series=200, max_length=60, seed=0):
+    """
+    Compare windowed_mean with pandas rolling means (a per-window reference)
+    for random windows, alignments and min_periods.
+    Returns: number of series checked. Raises AssertionError on mismatch.
+    """
+    rng = np.random.default_rng(seed)
+    for i in range(n_series):
+        n = int(rng.integers(1, max_length))
+        series = rng.normal(50, 10, n)
+        series[rng.random(n) < rng.random()] = np.nan
+        window = min(int(rng.integers(1, 8)), n)
+        center = bool(rng.integers(0, 2))
+        min_periods = int(rng.integers(1, window + 1))
+
+        expected = pd.Series(series).rolling(
+            window, center=center, min_periods=min_periods
+        ).mean().to_numpy()
+        result = windowed_mean(series, window, center, min_periods)
+        assert np.allclose(result, expected, equal_nan=True), f"Mismatch on series {i}"
+    return n_series
+
+
+def benchmark_weather_table(n_records=(1_000, 100_000, 1_000_000),
+                            reference_limit=100_000, seed=0):
+    """
+    Time impute_weather_table against impute_weather_data_buggy on synthetic
+    `weather_data` with ~20% missing cells.
+    Returns: list of dicts with timings in milliseconds
+    """
+    rng = np.random.default_rng(seed)
+    reference = None
+    results = []
+
+    for n in n_records:
+        values = rng.normal(25, 5, (n, len(WEATHER_FIELDS))).round(1)
+        values[rng.random(values.shape) < 0.2] = np.nan
+        dates = pd.date_range('2000-01-01', periods=n, freq='D').strftime('%Y-%m-%d')
+        data = {'city': 'Synthetic', 'weather_data': [
+            {'date': d, **{f: (None if np.isnan(v) else float(v))
+                           for f, v in zip(WEATHER_FIELDS, row)}}
+            for d, row in zip(dates, values)
+        ]}
+
+        start = time.perf_counter()
+        impute_weather_table(data)
+        fast_ms = (time.perf_counter() - start) * 1000
+
+        row = {'records': n, 'matrix_ms': round(fast_ms, 2), 'reference_ms': None}
+        if n <= reference_limit:
+            if reference is None:
+                reference = _reference_function('impute_weather_data_buggy', extra=[
+                    'linear_interpolation_buggy', 'moving_average_imputation_buggy'
+                ])
+            start = time.perf_counter()
+            reference(data)
+            row['reference_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            row['speedup'] = round(row['reference_ms'] / max(fast_ms, 1e-6), 1)
+        results.append(row)
+        print(row)
+
+    return results
+
+
+def benchmark_linear_interpolation(sizes=(1_000, 10_000, 100_000, 5_000_000),
+                                   reference_limit=100_000, burst_length=24):
+    """
+    Time linear_interpolate against linear_interpolation_buggy.
+
+    The Python reference is skipped above `reference_limit` points.
+    Returns: list of dicts with timings in milliseconds
+    """
+    reference = _reference_function('linear_interpolation_buggy')
+    results = []
+
+    for n in sizes:
+        series = _series_with_gaps(n, burst_length=burst_length)
+
+        start = time.perf_counter()
+        fast = linear_interpolate(series)
+        fast_ms = (time.perf_counter() - start) * 1000
+
+        row = {'points': n, 'vectorized_ms': round(fast_ms, 2), 'reference_ms': None}
+        if n <= reference_limit:
+            start = time.perf_counter()
+            slow = reference(series.tolist())
+            row['reference_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            row['speedup'] = round(row['reference_ms'] / max(fast_ms, 1e-6), 1)
+            assert np.allclose(fast, slow, equal_nan=True)
+        results.append(row)
+        print(row)
+
+    return results
+
+
+def benchmark_moving_average(sizes=(1_000, 10_000, 100_000, 5_000_000),
+                             reference_limit=100_000, window=24):
+    """
+    Time moving_average_impute against moving_average_imputation_buggy.
+
+    Results differ by design (the reference reads already-imputed values),
+    so only timings are compared.
+    Returns: list of dicts with timings in milliseconds
+    """
+    reference = _reference_function('moving_average_imputation_buggy')
+    results = []
+
+    for n in sizes:
+        series = _series_with_gaps(n, burst_length=4)
+
+        start = time.perf_counter()
+        moving_average_impute(series, window=window)
+        fast_ms = (time.perf_counter() - start) * 1000
+
+        row = {'points': n, 'vectorized_ms': round(fast_ms, 2), 'reference_ms': None}
+        if n <= reference_limit:
+            start = time.perf_counter()
+            reference(series.tolist(), window=window)
+            row['reference_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            row['speedup'] = round(row['reference_ms'] / max(fast_ms, 1e-6), 1)
+        results.append(row)
+        print(row)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(f"Equivalence: {check_linear_equivalence()} series match")
+    print(f"Moving average: {check_moving_average()} series match pandas rolling")
+    benchmark_linear_interpolation()
+    benchmark_moving_average()
+    benchmark_weather_table()
@@ -0,0 +1,151 @@
+# imputation_audit.py - Bitset-Backed Imputation Audit Trail
+"""
+Compact record of which cells were missing and which were imputed.
+
+For every field two bit masks are kept, packed with np.packbits (8 rows per
+byte): `missing` (originally missing) and `imputed` (missing -> filled).
+Four weather fields therefore cost one byte per row, instead of keeping a
+second copy of the JSON. Counts use a popcount table over the packed bytes;
+gap runs and per-date coverage unpack a single field at a time.
+
+Typical use with the matrix pipeline:
+
+    table, counts, missing = impute_weather_table(data)
+    audit = ImputationAudit.from_imputation(table, missing)
+    audit.save('tokyo_imputed_audit.npz')
+"""
+
+import numpy as np
+import pandas as pd
+
+from examples_py.imputation import WEATHER_FIELDS
+
+# Number of set bits for every byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class ImputationAudit:
+    """Packed missing / imputed bit masks per field, plus optional row dates"""
+
+    def __init__(self, fields, n_rows, missing_bits, imputed_bits, dates=None):
+        self.fields = list(fields)
+        self.n_rows = int(n_rows)
+        self.missing_bits = missing_bits      # field -> packed uint8 array
+        self.imputed_bits = imputed_bits      # field -> packed uint8 array
+        self.dates = dates                    # datetime64[D] array or None
+
+    @classmethod
+    def from_masks(cls, fields, missing, imputed, dates=None):
+        """Build from (rows x fields) boolean masks"""
+        missing = np.asarray(missing, dtype=bool)
+        imputed = np.asarray(imputed, dtype=bool)
+        if missing.shape != imputed.shape or missing.shape[1] != len(fields):
+            raise ValueError("missing/imputed masks must both be rows x fields")
+        if dates is not None:
+            dates = pd.to_datetime(pd.Series(dates), errors='coerce').to_numpy(dtype='datetime64[D]')
+        return cls(
+            fields, missing.shape[0],
+            {f: np.packbits(missing[:, j]) for j, f in enumerate(fields)},
+            {f: np.packbits(imputed[:, j]) for j, f in enumerate(fields)},
+            dates,
+        )
+
+    @classmethod
+    def from_imputation(cls, table, missing, fields=WEATHER_FIELDS, date_col='date'):
+        """Build from impute_weather_table output (imputed table + input missing mask)"""
+        imputed = missing & ~np.isnan(table[fields].to_numpy(dtype=float))
+        dates = table[date_col] if date_col in table.columns else None
+        return cls.from_masks(fields, missing, imputed, dates)
+
+    # --- Queries ------------------------------------------------------------
+
+    def _unpack(self, bits):
+        return np.unpackbits(bits, count=self.n_rows).astype(bool)
+
+    def counts(self):
+        """field -> {'missing': n, 'imputed': n, 'still_missing': n}"""
+        result = {}
+        for f in self.fields:
+            missing = int(POPCOUNT[self.missing_bits[f]].sum(dtype=np.int64))
+            imputed = int(POPCOUNT[self.imputed_bits[f]].sum(dtype=np.int64))
+            result[f] = {'missing': missing, 'imputed': imputed, 'still_missing': missing - imputed}
+        return result
+
+    def missing_fraction(self):
+        """field -> fraction of rows originally missing"""
+        if self.n_rows == 0:
+            return {f: 0.0 for f in self.fields}
+        return {f: c['missing'] / self.n_rows for f, c in self.counts().items()}
+
+    def fields_needing_review(self, threshold=0.5):
+        """Fields whose missing fraction is above `threshold` (default: >50% missing)"""
+        return [f for f, frac in self.missing_fraction().items() if frac > threshold]
+
+    def longest_gap(self, field):
+        """
+        Longest run of consecutive originally-missing rows in `field`.
+        Returns: (length, start_row) - (0, None) if nothing is missing
+        """
+        mask = self._unpack(self.missing_bits[field])
+        if not mask.any():
+            return 0, None
+        edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+        i = int(np.argmax(lengths))
+        return int(lengths[i]), int(starts[i])
+
+    def imputed_rows(self, field):
+        """Row indices that were filled by imputation"""
+        return np.flatnonzero(self._unpack(self.imputed_bits[field]))
+
+    def coverage_by_date(self):
+        """
+        Fraction of fields originally observed per row (per date if dates are known).
+        Returns: pandas Series
+        """
+        observed = np.zeros(self.n_rows, dtype=np.int32)
+        for f in self.fields:
+            observed += ~self._unpack(self.missing_bits[f])
+        coverage = observed / max(len(self.fields), 1)
+        index = pd.DatetimeIndex(self.dates, name='date') if self.dates is not None else None
+        return pd.Series(coverage, index=index, name='coverage')
+
+    def summary(self, threshold=0.5):
+        """Report dict: counts, longest gaps and fields above the review threshold"""
+        return {
+            'rows': self.n_rows,
+            'counts': self.counts(),
+            'longest_gap': {f: self.longest_gap(f)[0] for f in self.fields},
+            'needs_review': self.fields_needing_review(threshold),
+        }
+
+    def nbytes(self):
+        """Storage used by the bit masks"""
+        return sum(b.nbytes for b in self.missing_bits.values()) + \
+            sum(b.nbytes for b in self.imputed_bits.values())
+
+    # --- Storage ------------------------------------------------------------
+
+    def save(self, path):
+        """Store the packed masks (and dates as datetime64[D], NaT preserved) in an .npz file"""
+        arrays = {'fields': np.array(self.fields), 'n_rows': np.array(self.n_rows)}
+        for f in self.fields:
+            arrays[f'missing__{f}'] = self.missing_bits[f]
+            arrays[f'imputed__{f}'] = self.imputed_bits[f]
+        if self.dates is not None:
+            arrays['dates'] = self.dates.astype('datetime64[D]')
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            fields = [str(f) for f in data['fields']]
+            dates = data['dates'].astype('datetime64[D]') if 'dates' in data.files else None
+            return cls(
+                fields, int(data['n_rows']),
+                {f: data[f'missing__{f}'] for f in fields},
+                {f: data[f'imputed__{f}'] for f in fields},
+                dates,
+            )
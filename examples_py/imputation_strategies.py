@@ -0,0 +1,239 @@
+# imputation_strategies.py - Imputation Strategy Registry and Benchmark Harness
+"""
+Registry of gap-filling strategies with one vectorized interface:
+
+    strategy(values, times=None, **params) -> float64 array
+
+values: 1-D array with NaN (or list with None); times: datetime64 per value,
+used by time-based strategies and ignored by the others.
+
+Registered strategies:
+    linear          - interpolation by position (imputation.linear_interpolate)
+    time_linear     - interpolation by elapsed time (imputation.time_interpolate)
+    moving_average  - windowed mean of original observations, linear fallback
+    seasonal_naive  - value from the nearest earlier (else later) season, e.g. period=24 for hourly data
+    spline          - natural cubic spline through the valid points (needs scipy)
+
+`benchmark_strategies` masks known values of complete synthetic series with
+random and burst gap patterns and reports points/sec and reconstruction error
+for each strategy.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from examples_py.imputation import (
+    linear_interpolate, moving_average_impute, time_interpolate, to_float_array
+)
+
+STRATEGIES = {}
+
+
+def register_strategy(name):
+    """Decorator adding a function to the registry under `name`"""
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}. Available: {sorted(STRATEGIES)}") from None
+
+
+def impute(values, strategy='linear', times=None, **params):
+    """Run a registered strategy"""
+    return get_strategy(strategy)(values, times=times, **params)
+
+
+@register_strategy('linear')
+def _linear(values, times=None, min_valid=2):
+    return linear_interpolate(values, min_valid=min_valid)
+
+
+@register_strategy('time_linear')
+def _time_linear(values, times=None, min_valid=2):
+    if times is None:
+        return linear_interpolate(values, min_valid=min_valid)
+    return time_interpolate(values, times, min_valid=min_valid)
+
+
+@register_strategy('moving_average')
+def _moving_average(values, times=None, window=3, center=True, min_periods=1, fallback='linear'):
+    return moving_average_impute(values, window=window, center=center,
+                                 min_periods=min_periods, fallback=fallback)
+
+
+@register_strategy('seasonal_naive')
+def seasonal_naive(values, times=None, period=24, fallback='linear'):
+    """
+    Fill each gap with the value one (or more) seasons earlier; if the phase
+    has no earlier value, the nearest later season is used.
+
+    The series is laid out as a (seasons x period) matrix, so forward/backward
+    fill along the season axis is a running max/min over row indices.
+    fallback='linear' interpolates gaps no season can fill; None leaves them NaN.
+    """
+    if fallback not in ('linear', None):
+        raise ValueError(f"Unknown fallback: {fallback}")
+    arr = to_float_array(values).copy()
+    n = len(arr)
+    missing = np.isnan(arr)
+    if not missing.any() or n == 0:
+        return arr
+
+    period = max(1, int(period))
+    rows = -(-n // period)
+    grid = np.full(rows * period, np.nan)
+    grid[:n] = arr
+    grid = grid.reshape(rows, period)
+    valid = ~np.isnan(grid)
+
+    row_idx = np.arange(rows)[:, None]
+    prev_row = np.maximum.accumulate(np.where(valid, row_idx, -1), axis=0)
+    next_row = np.minimum.accumulate(np.where(valid, row_idx, rows)[::-1], axis=0)[::-1]
+
+    cols = np.broadcast_to(np.arange(period), grid.shape)
+    from_prev = grid[np.clip(prev_row, 0, rows - 1), cols]
+    from_next = grid[np.clip(next_row, 0, rows - 1), cols]
+    filled = np.where(prev_row >= 0, from_prev, np.where(next_row < rows, from_next, np.nan))
+
+    out = np.where(valid, grid, filled).reshape(-1)[:n]
+    if fallback == 'linear':
+        out = linear_interpolate(out, min_valid=1)
+    return out
+
+
+@register_strategy('spline')
+def spline(values, times=None, min_valid=4):
+    """
+    Natural cubic spline through the valid points (x = time if given, else position).
+    Edge gaps take the nearest valid value instead of extrapolating.
+    Points with a NaT time are left as they are; duplicate times raise ValueError.
+    """
+    try:
+        from scipy.interpolate import CubicSpline
+    except ImportError:
+        raise ImportError("The 'spline' strategy requires scipy: pip install scipy") from None
+
+    arr = to_float_array(values).copy()
+    if times is not None:
+        stamps = np.asarray(times).astype('datetime64[s]')
+        timed = ~np.isnat(stamps)
+        x = np.where(timed, stamps.astype(np.int64), 0).astype(float)
+        if len(np.unique(x[timed])) < timed.sum():
+            raise ValueError("spline needs unique times; aggregate duplicate timestamps first")
+    else:
+        timed = np.ones(len(arr), dtype=bool)
+        x = np.arange(len(arr), dtype=float)
+
+    missing = np.isnan(arr) & timed
+    if not missing.any():
+        return arr
+
+    valid = ~np.isnan(arr) & timed
+    if valid.sum() < min_valid:
+        return linear_interpolate(arr)
+
+    order = np.argsort(x[valid], kind='stable')
+    xv, yv = x[valid][order], arr[valid][order]
+    inside = missing & (x > xv[0]) & (x < xv[-1])
+    arr[inside] = CubicSpline(xv, yv, bc_type='natural')(x[inside])
+
+    outside = missing & ~inside
+    arr[outside] = np.interp(x[outside], xv, yv)   # clamps to the edge values
+    return arr
+
+
+# --- Benchmark harness ------------------------------------------------------
+
+def synthetic_series(n, freq='h', seed=0):
+    """Complete series with daily and yearly cycles plus noise, and its timestamps"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2000-01-01', periods=n, freq=freq).to_numpy()
+    hours = (times - times[0]) / np.timedelta64(1, 'h')
+    values = (15
+              + 8 * np.sin(2 * np.pi * hours / (24 * 365.25))
+              + 5 * np.sin(2 * np.pi * (hours % 24) / 24 - np.pi / 2)
+              + rng.normal(0, 0.8, n))
+    return values, times
+
+
+def gap_mask(n, pattern='random', fraction=0.1, burst_length=24, seed=0):
+    """
+    Boolean mask of values to hide.
+    'random' - independent points; 'burst' - runs of `burst_length` consecutive points
+    """
+    rng = np.random.default_rng(seed)
+    if pattern == 'random':
+        return rng.random(n) < fraction
+    if pattern == 'burst':
+        mask = np.zeros(n, dtype=bool)
+        n_bursts = max(1, int(n * fraction / burst_length))
+        starts = rng.integers(0, max(1, n - burst_length), n_bursts)
+        idx = (starts[:, None] + np.arange(burst_length)).ravel()
+        mask[idx[idx < n]] = True
+        return mask
+    raise ValueError(f"Unknown gap pattern: {pattern}")
+
+
+DEFAULT_BENCHMARK_PARAMS = {
+    'moving_average': {'window': 5},
+    'seasonal_naive': {'period': 24},
+}
+
+
+def benchmark_strategies(n=1_000_000, strategies=None, patterns=('random', 'burst'),
+                         fraction=0.1, burst_length=24, params=None, seed=0):
+    """
+    Mask known values, impute them with every strategy and compare.
+
+    Returns: DataFrame with one row per (strategy, pattern): points/sec over the
+             whole series, MAE/RMSE on the masked points, unfilled count
+    """
+    names = list(strategies) if strategies else list(STRATEGIES)
+    params = {**DEFAULT_BENCHMARK_PARAMS, **(params or {})}
+    truth, times = synthetic_series(n, seed=seed)
+    rows = []
+
+    for pattern in patterns:
+        mask = gap_mask(n, pattern, fraction, burst_length, seed=seed)
+        observed = truth.copy()
+        observed[mask] = np.nan
+
+        for name in names:
+            func = get_strategy(name)
+            try:
+                start = time.perf_counter()
+                result = func(observed, times=times, **params.get(name, {}))
+                seconds = time.perf_counter() - start
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+                continue
+
+            errors = result[mask] - truth[mask]
+            filled = ~np.isnan(errors)
+            rows.append({
+                'strategy': name,
+                'pattern': pattern,
+                'points': n,
+                'masked': int(mask.sum()),
+                'seconds': round(seconds, 4),
+                'points_per_sec': round(n / seconds) if seconds > 0 else None,
+                'mae': float(np.abs(errors[filled]).mean()) if filled.any() else None,
+                'rmse': float(np.sqrt((errors[filled] ** 2).mean())) if filled.any() else None,
+                'unfilled': int((~filled).sum()),
+            })
+
+    report = pd.DataFrame(rows)
+    return report.sort_values(['pattern', 'rmse']).reset_index(drop=True) if not report.empty else report
+
+
+if __name__ == "__main__":
+    pd.set_option('display.width', 120)
+    print(benchmark_strategies().to_string(index=False))
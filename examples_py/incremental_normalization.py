@@ -0,0 +1,246 @@
+# incremental_normalization.py - Incremental Normalization with Change Tracking
+"""
+Incremental version of the Task C normalization run.
+
+A manifest records, for every source file, its size, mtime, content hash
+and the number of rows it produced. The combined output keeps each file's
+rows together, in manifest order, so a file's rows are located by position
+rather than by (city, date): sources that share keys (backfills) or rows
+without a date are removed exactly. The output's own size, mtime and hash
+are recorded too; if anything else rewrote it (example3, normalize_all),
+the positions are meaningless and the run falls back to a full rebuild. On rerun only new or changed files are
+re-normalized; their old rows (and rows of deleted files) are removed from
+the combined output and the fresh rows are appended.
+
+Manifest format (JSON):
+{
+  "version": 3,
+  "output": "cities_comparison.csv",
+  "output_stat": {"size": 2048, "mtime_ns": ..., "sha256": "..."},
+  "files": {
+    "tokyo_weather.json": {"size": 512, "mtime_ns": ..., "sha256": "...", "rows": 10},
+    ...
+  }
+}
+"""
+
+import json
+import os
+import pandas as pd
+
+from examples_py.file_hash import file_sha256
+from examples_py.normalize_tokyo import normalize_tokyo_data
+from examples_py.normalize_newyork import normalize_newyork_data
+from examples_py.normalize_london import normalize_london_data
+
+MANIFEST_VERSION = 3
+DEFAULT_MANIFEST = 'normalization_manifest.json'
+DEFAULT_OUTPUT = 'cities_comparison.csv'
+COLUMNS = ['city', 'date', 'max', 'min', 'precip', 'wind', 'humidity']
+
+# Source file -> normalizer for its schema
+DEFAULT_SOURCES = {
+    'tokyo_weather.json': normalize_tokyo_data,
+    'newyork_weather.json': normalize_newyork_data,
+    'london_weather.json': normalize_london_data,
+}
+
+
+def load_manifest(path=DEFAULT_MANIFEST):
+    """Load the manifest, or an empty one if missing / unreadable / outdated"""
+    empty = {'version': MANIFEST_VERSION, 'output': None, 'files': {}}
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return empty
+    except json.JSONDecodeError:
+        print(f"⚠️ Manifest {path} is corrupt, doing a full rebuild")
+        return empty
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def save_manifest(manifest, path=DEFAULT_MANIFEST):
+    """Write the manifest atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def detect_changes(sources, manifest):
+    """
+    Compare source files against the manifest.
+
+    Size and mtime are checked first; the hash is only computed when they
+    differ, so a touched-but-identical file is not re-normalized.
+    Returns: dict with 'new', 'changed', 'unchanged', 'deleted' lists and
+             the current file stats keyed by path
+    """
+    known = manifest.get('files', {})
+    changes = {'new': [], 'changed': [], 'unchanged': [], 'deleted': []}
+    stats = {}
+
+    for path in sources:
+        if not os.path.exists(path):
+            if path in known:
+                changes['deleted'].append(path)
+            continue
+
+        st = os.stat(path)
+        entry = known.get(path)
+        stats[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+        if entry is None:
+            changes['new'].append(path)
+        elif entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            stats[path]['sha256'] = entry['sha256']
+            changes['unchanged'].append(path)
+        else:
+            sha = file_sha256(path)
+            stats[path]['sha256'] = sha
+            if sha == entry['sha256']:
+                changes['unchanged'].append(path)
+            else:
+                changes['changed'].append(path)
+
+    # Files tracked in the manifest that are no longer configured as sources
+    for path in known:
+        if path not in sources and path not in changes['deleted']:
+            changes['deleted'].append(path)
+
+    return changes, stats
+
+
+def _file_stat(path):
+    """Size, mtime and SHA-256 of a file"""
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+def _output_matches(manifest, output):
+    """True if `output` is still the file this manifest wrote"""
+    recorded = manifest.get('output_stat')
+    if not recorded:
+        return False
+    st = os.stat(output)
+    if recorded['size'] != st.st_size:
+        return False
+    if recorded['mtime_ns'] == st.st_mtime_ns:
+        return True
+    return recorded['sha256'] == file_sha256(output)
+
+
+def _file_ranges(files):
+    """Row range [start, end) of every file in the combined output (manifest order)"""
+    ranges, start = {}, 0
+    for path, entry in files.items():
+        ranges[path] = (start, start + entry['rows'])
+        start += entry['rows']
+    return ranges, start
+
+
+def _remove_ranges(df, ranges):
+    """Drop the given [start, end) row ranges"""
+    if df.empty or not ranges:
+        return df
+    keep = pd.Series(True, index=range(len(df)))
+    for start, end in ranges:
+        keep.iloc[start:end] = False
+    return df.loc[keep.to_numpy()].reset_index(drop=True)
+
+
+def incremental_normalization(sources=None, output=DEFAULT_OUTPUT,
+                              manifest_path=DEFAULT_MANIFEST, force=False):
+    """
+    Normalize only new/changed source files and merge them into `output`.
+
+    sources - dict of file path -> normalizer function (default: the three cities)
+    force   - ignore the manifest and rebuild everything
+    Returns: (combined DataFrame, summary dict)
+    """
+    sources = DEFAULT_SOURCES if sources is None else sources
+    manifest = load_manifest(manifest_path)
+
+    # A missing or different output file invalidates the whole manifest
+    if force or manifest.get('output') != output or not os.path.exists(output):
+        manifest = {'version': MANIFEST_VERSION, 'output': output, 'files': {}}
+        combined = pd.DataFrame(columns=COLUMNS)
+    elif not _output_matches(manifest, output):
+        print(f"⚠️ {output} was rewritten since the manifest was saved, doing a full rebuild")
+        manifest = {'version': MANIFEST_VERSION, 'output': output, 'files': {}}
+        combined = pd.DataFrame(columns=COLUMNS)
+    else:
+        combined = pd.read_csv(output, dtype={'city': str, 'date': str})
+        if _file_ranges(manifest['files'])[1] != len(combined):
+            print(f"⚠️ {output} does not match the manifest, doing a full rebuild")
+            manifest = {'version': MANIFEST_VERSION, 'output': output, 'files': {}}
+            combined = pd.DataFrame(columns=COLUMNS)
+
+    changes, stats = detect_changes(sources, manifest)
+    files = manifest['files']
+
+    # Remove rows produced by changed and deleted files; their entries are
+    # re-added at the end, matching where the fresh rows are appended
+    ranges = _file_ranges(files)[0]
+    stale = [ranges[path] for path in changes['changed'] + changes['deleted']]
+    rows_removed = sum(end - start for start, end in stale)
+    combined = _remove_ranges(combined, stale)
+    for path in changes['changed'] + changes['deleted']:
+        del files[path]
+
+    # Re-normalize new and changed files
+    new_frames = [combined]
+    failed = []
+    for path in changes['new'] + changes['changed']:
+        try:
+            with open(path, 'r') as f:
+                raw = json.load(f)
+            records = sources[path](raw)
+        except Exception as e:
+            print(f"❌ {path} failed: {e}")
+            failed.append(path)
+            # Rows were already removed above; the file stays out of the manifest
+            # so it is retried next run
+            continue
+
+        stat = stats[path]
+        if 'sha256' not in stat:
+            stat['sha256'] = file_sha256(path)
+        files[path] = dict(stat, rows=len(records))
+        new_frames.append(pd.DataFrame(records, columns=COLUMNS))
+        print(f"✅ {path}: {len(records)} records")
+
+    # Refresh stats of unchanged files whose mtime moved but content did not
+    for path in changes['unchanged']:
+        files[path].update(stats[path])
+
+    frames = [frame for frame in new_frames if not frame.empty]
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    combined = combined[COLUMNS]
+
+    tmp_output = output + '.tmp'
+    combined.to_csv(tmp_output, index=False)
+    os.replace(tmp_output, output)
+    manifest['output_stat'] = _file_stat(output)
+    save_manifest(manifest, manifest_path)
+
+    summary = {
+        'new': len(changes['new']),
+        'changed': len(changes['changed']),
+        'unchanged': len(changes['unchanged']),
+        'deleted': len(changes['deleted']),
+        'failed': failed,
+        'rows_removed': rows_removed,
+        'total_rows': len(combined),
+    }
+    print(f"Incremental update: {summary}")
+    return combined, summary
+
+
+if __name__ == "__main__":
+    df, summary = incremental_normalization()
+    print(f"Saved {len(df)} records to {DEFAULT_OUTPUT}")
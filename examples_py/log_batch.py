@@ -0,0 +1,168 @@
+# log_batch.py - Multiprocess Chunked Extraction for Large Weather Log Files
+"""
+Batch mode for Task F on log archives too large for readlines().
+
+The file is split into byte ranges whose boundaries are moved forward to the
+next newline, so every line belongs to exactly one range. Workers open the
+file themselves, read only their range and run
+weather_extract.extract_weather_fields on each line; they return the CSV
+text of their range, not Python objects, which keeps inter-process traffic
+small.
+
+The parent writes the chunks in range order, so the output has the same
+row order as the input. Only a bounded number of ranges are in flight at a
+time (2 per worker), so memory does not grow with the file size. Nothing
+is printed per line; extract_log_file() returns a summary.
+
+Output columns match main_weather_extraction_buggy:
+Date, Max Temperature, Min Temperature, Humidity, Precipitation.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from examples_py.weather_extract import FIELDS, extract_weather_fields, generate_log_corpus
+
+CSV_HEADER = 'Date,Max Temperature,Min Temperature,Humidity,Precipitation\n'
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def line_aligned_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Split a file into (start, end) byte ranges of about chunk_bytes each.
+    Every range except the last ends just after a newline.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end - 1)
+                f.readline()            # finish the line that crosses the boundary
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def extract_range(path, start, end):
+    """
+    Extract every non-empty line in bytes [start, end) of a log file.
+    Returns: (CSV text without header, lines read, lines with at least one field)
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    rows, n_lines, n_found = [], 0, 0
+    # Split on '\n' only, like line_aligned_ranges (splitlines() also breaks on \x0b, \u2028, ...)
+    for line in data.decode('utf-8', errors='replace').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        n_lines += 1
+        result = extract_weather_fields(line)
+        values = [result[field] for field in FIELDS]
+        if any(v is not None for v in values):
+            n_found += 1
+        rows.append(','.join(map(_csv_value, values)))
+    text = '\n'.join(rows) + '\n' if rows else ''
+    return text, n_lines, n_found
+
+
+def _range_job(args):
+    return extract_range(*args)
+
+
+def extract_log_file(path, output, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Extract a whole log file into a CSV, in the original line order.
+
+    workers     - pool size (default os.cpu_count()); 1 extracts in-process
+    chunk_bytes - approximate bytes per range handed to a worker
+    Returns: dict with lines, extracted, chunks, workers, seconds, lines_per_sec
+    """
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    jobs = [(path, start, end) for start, end in line_aligned_ranges(path, chunk_bytes)]
+    n_lines = n_found = 0
+
+    with open(output, 'w', encoding='utf-8', newline='') as out:
+        out.write(CSV_HEADER)
+
+        def write(result):
+            nonlocal n_lines, n_found
+            text, lines, found = result
+            out.write(text)
+            n_lines += lines
+            n_found += found
+
+        if workers == 1:
+            for job in jobs:
+                write(_range_job(job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for job in jobs:
+                    pending.append(executor.submit(_range_job, job))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    seconds = time.perf_counter() - start_time
+    return {'lines': n_lines, 'extracted': n_found, 'chunks': len(jobs), 'workers': workers,
+            'seconds': round(seconds, 2), 'lines_per_sec': round(n_lines / seconds) if seconds else None}
+
+
+# --- Benchmark --------------------------------------------------------------
+
+def benchmark_log_batch(n_lines=1_000_000, path='weather_logs_batch_benchmark.txt',
+                        output='weather_logs_batch_benchmark.csv', worker_counts=None,
+                        chunk_bytes=4 * 1024 * 1024):
+    """
+    Extract a generated log file with increasing pool sizes and check that
+    every run writes the same CSV. Returns: list of report dicts
+    """
+    generate_log_corpus(path, n_lines)
+    cpus = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+
+    results, baseline, expected = [], None, None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        report = extract_log_file(path, output, workers=workers, chunk_bytes=chunk_bytes)
+        seconds = time.perf_counter() - start    # report['seconds'] is rounded
+        with open(output, 'rb') as f:
+            content = f.read()
+        expected = expected if expected is not None else content
+        assert content == expected, f"output differs with {workers} workers"
+        baseline = baseline or seconds
+        report['speedup'] = round(baseline / seconds, 2)
+        print(report)
+        results.append(report)
+
+    os.remove(path)
+    os.remove(output)
+    return results
+
+
+if __name__ == "__main__":
+    if os.path.exists('weather_logs.txt'):
+        summary = extract_log_file('weather_logs.txt', 'extracted_weather_data.csv')
+        print(f"✅ {summary['extracted']}/{summary['lines']} lines extracted to extracted_weather_data.csv")
+    benchmark_log_batch()
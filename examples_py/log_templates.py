@@ -0,0 +1,271 @@
+# log_templates.py - Template-Mining Cache for Repetitive Weather Log Formats
+"""
+Fast path for Task F logs written by a small number of station formats.
+
+The template key of a line is the line with every digit masked to 0 (one
+C-level bytes.translate), so these two lines share a template:
+
+    2024-08-21 Maximum temperature 89°F minimum 74°F humidity 68% ...
+    2024-09-02 Maximum temperature 91°F minimum 70°F humidity 55% ...
+
+The scanner only distinguishes digits from other characters, so lines with
+the same key are tokenized the same way; a different digit count
+('21/08/24' vs '20/08/2024') is a different template. The line is also
+split on its numbers (one re.split) to get the values.
+
+The first line of a template goes through the full scanner
+(weather_extract.scan_tokens), which reports the token that set each field.
+Those tokens are mapped to number positions in the split, and the template
+remembers a plan: which number feeds which field and how it is converted
+(°F -> °C, unitless temperature, numeric date, month-name date). Later lines
+with the same template skip the scanner and only convert the planned
+numbers.
+
+Templates whose fields do not line up with whole numbers are remembered as
+not cacheable and always use the full scanner. A plan that cannot be
+applied to a line (a date that is not a real date, a day above 31, a year
+outside 1-9999) falls back to the full scanner for that line, and a line
+whose date could not be parsed is not used to learn its template.
+verify_every=N re-checks every N-th hit against the full scanner and counts
+mismatches.
+"""
+
+import re
+import time
+
+from examples_py.weather_extract import (
+    DATE, FIELDS, MAX_TEMP, MIN_TEMP, MONTH, SCANNER, _celsius, _date_token, _iso,
+    _unitless_to_celsius, _word_slots, extract_weather_fields, scan_tokens,
+)
+
+# Same number syntax as the scanner's value tokens; the group keeps numbers in the split
+NUMBER_SPLIT = re.compile(r'(-?\d+(?:[.,]\d+)?)')
+
+# Plan operations; month-name dates use MONTH_DATE + month number
+NUMBER, FAHRENHEIT, UNITLESS_TEMP, DATE_TEXT, MONTH_DATE = range(5)
+
+_DIGIT_MASK = bytes.maketrans(b'123456789', b'000000000')
+_UNKNOWN = object()
+_RETRY = object()      # learn_plan: do not learn from this line, try the next one
+
+
+def template_key(line):
+    """The line (UTF-8) with every ASCII digit replaced by 0"""
+    return line.encode('utf-8').translate(_DIGIT_MASK)
+
+
+def _number_positions(parts):
+    """(start, end) character offset -> index in parts, for every number"""
+    starts, ends = {}, {}
+    pos = 0
+    for index, piece in enumerate(parts):
+        if index % 2:
+            starts[pos] = index
+            ends[pos + len(piece)] = index
+        pos += len(piece)
+    return starts, ends
+
+
+def learn_plan(line, parts):
+    """
+    Scan a line with the full scanner and derive its template plan.
+    Returns: (field values, plan tuple, None if the template is not cacheable,
+             or _RETRY if this line cannot teach it)
+    """
+    matches = list(SCANNER.finditer(line))
+    sources = [None] * len(FIELDS)
+    values = scan_tokens([m.groups('') for m in matches], sources)
+    starts, ends = _number_positions(parts)
+
+    # If a date token failed to parse, other lines of the template may parse it
+    # and take a different date: only learn from lines whose first attempt succeeded
+    first_attempt = next((i for i, m in enumerate(matches)
+                          if m.group('date') or _word_slots.get(m.group('word'), -1) >= MONTH), None)
+    if first_attempt is not None:
+        date_source = sources[DATE][0] if isinstance(sources[DATE], tuple) else sources[DATE]
+        if date_source != first_attempt:
+            return values, _RETRY
+
+    def number_at(match, group):
+        start, end = match.span(group)
+        index = starts.get(start)
+        return index if index is not None and ends.get(end) == index else None
+
+    plan = []
+    for slot, source in enumerate(sources):
+        if source is None:
+            continue
+        if slot == DATE and isinstance(source, tuple):
+            month_at, day_at, year_at = source
+            day, year = number_at(matches[day_at], 'value'), number_at(matches[year_at], 'value')
+            if day is None or year is None:
+                return values, None
+            month = _word_slots[matches[month_at].group('word')] - MONTH
+            plan.append((slot, MONTH_DATE + month, day, year))
+        elif slot == DATE:
+            start, end = matches[source].span('date')
+            first, last = starts.get(start), ends.get(end)
+            if first is None or last is None:
+                return values, None
+            plan.append((slot, DATE_TEXT, first, last + 1))
+        else:
+            index = number_at(matches[source], 'value')
+            if index is None:
+                return values, None
+            op = NUMBER
+            if slot == MAX_TEMP or slot == MIN_TEMP:
+                unit = matches[source].group('unit') or ''
+                if unit[-1:] in ('F', 'f'):
+                    op = FAHRENHEIT
+                elif not unit:
+                    op = UNITLESS_TEMP
+            plan.append((slot, op, index, None))
+
+    plan = tuple(plan)
+    if apply_plan(plan, parts) != values:
+        return values, None
+    return values, plan
+
+
+def apply_plan(plan, parts):
+    """
+    Field values of a split line from a template plan.
+    Returns: list of 5 values, or None when the plan does not fit this line
+    """
+    values = [None] * 5
+    unitless = None
+    for slot, op, a, b in plan:
+        if op == NUMBER:
+            values[slot] = float(parts[a].replace(',', '.'))
+        elif op == FAHRENHEIT:
+            values[slot] = _celsius(float(parts[a].replace(',', '.')))
+        elif op == UNITLESS_TEMP:
+            values[slot] = float(parts[a].replace(',', '.'))
+            unitless = [slot] if unitless is None else unitless + [slot]
+        else:
+            # An invalid date lets the full scanner try later date tokens
+            if op == DATE_TEXT:
+                date = _date_token(''.join(parts[a:b]))
+            elif int(parts[a]) <= 31:
+                date = _iso(int(parts[b]), op - MONTH_DATE, int(parts[a]))
+            else:
+                date = None
+            if date is None:
+                return None
+            values[slot] = date
+    if unitless:
+        _unitless_to_celsius(values, unitless)
+    return values
+
+
+class TemplateExtractor:
+    """extract_weather_fields with a per-template fast path"""
+
+    def __init__(self, max_templates=10_000, verify_every=0):
+        self.templates = {}       # template key -> plan, or None if not cacheable
+        self.max_templates = max_templates
+        self.verify_every = verify_every
+        self.hits = self.misses = self.uncached = self.fallbacks = 0
+        self.verified = self.mismatches = 0
+
+    def extract(self, line):
+        """Same result as weather_extract.extract_weather_fields(line)"""
+        key = template_key(line)
+        parts = NUMBER_SPLIT.split(line)
+        plan = self.templates.get(key, _UNKNOWN)
+
+        if plan is _UNKNOWN:
+            self.misses += 1
+            values, plan = learn_plan(line, parts)
+            if plan is not _RETRY and len(self.templates) < self.max_templates:
+                self.templates[key] = plan
+            return dict(zip(FIELDS, values))
+        if plan is None:
+            self.uncached += 1
+            return extract_weather_fields(line)
+
+        values = apply_plan(plan, parts)
+        if values is None:
+            self.fallbacks += 1
+            return extract_weather_fields(line)
+        self.hits += 1
+
+        if self.verify_every and self.hits % self.verify_every == 0:
+            self.verified += 1
+            full = extract_weather_fields(line)
+            if list(full.values()) != values:
+                self.mismatches += 1
+                return full
+        return dict(zip(FIELDS, values))
+
+    def extract_lines(self, lines):
+        """Extract every non-empty line. Returns: list of result dicts"""
+        return [self.extract(line) for line in lines if line.strip()]
+
+    def report(self):
+        lines = self.hits + self.misses + self.uncached + self.fallbacks
+        return {'lines': lines, 'templates': len(self.templates),
+                'uncacheable_templates': sum(plan is None for plan in self.templates.values()),
+                'hits': self.hits, 'misses': self.misses, 'uncached': self.uncached,
+                'fallbacks': self.fallbacks,
+                'hit_rate': round(self.hits / lines, 4) if lines else None,
+                'verified': self.verified, 'mismatches': self.mismatches}
+
+
+# --- Benchmark --------------------------------------------------------------
+
+# Lines whose neighbours look alike but must not share a plan; each group
+# teaches a template first, then feeds lines the full scanner reads differently
+DIVERGENCE_LINES = [
+    "20/08/2024 Max 30C Min 20C", "21/08/24 Max 31C Min 21C",              # 2-digit year: no date
+    "Max 12/05/2024 High 50F", "Max 123/05/2024 High 50F",                # 3-digit day: a value
+    "2024-08-18 Max 87F Min 72F", "2024-02-30 Max 87F Min 72F",          # impossible date
+    "2024-02-30 2024-03-01 Max 80F", "2024-02-28 2024-03-01 Max 80F",    # first date invalid
+    "2024-02-29 2024-03-01 Max 80F", "2023-02-29 2024-03-01 Max 80F",
+    "Aug 19 2024 High 91F Low 75F", "Aug 39 2024 High 91F Low 75F",      # day above 31
+    "Aug 19 2024 High 91F Low 75F", "Aug 19 2023 High 91F Low 75F",
+    "Max 30 Min 20", "Max 61 Min 40", "Max 40 Min 61",                   # unitless unit per line
+    "Max -5.5C Min -12C", "Max 5.5C Min 12C", "Max 5,5C Min 1,2C",       # signs and decimal commas
+    "Humidity 80% Rain 2mm", "Humidity 80% Rain 22mm", "Humidity 8% Rain 2.5mm",
+    "May 3 reading id 1693555200000 Max 30C", "May 4 reading id 1693641600000 Max 31C",  # id as year
+    "May 3 2024 Max 30C", "May 3 9999 Max 30C", "May 3 0000 Max 30C",
+]
+
+
+def benchmark_templates(n_lines=500_000, path='weather_logs_template_benchmark.txt'):
+    """Full scanner vs template cache on a generated corpus (results must be identical)"""
+    import os
+    from examples_py.weather_extract import generate_log_corpus
+
+    generate_log_corpus(path, n_lines)
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines() + DIVERGENCE_LINES
+    os.remove(path)
+
+    start = time.perf_counter()
+    expected = [extract_weather_fields(line) for line in lines]
+    full_seconds = time.perf_counter() - start
+
+    extractor = TemplateExtractor()
+    start = time.perf_counter()
+    results = [extractor.extract(line) for line in lines]
+    cached_seconds = time.perf_counter() - start
+    assert results == expected, "template cache changed an extraction result"
+
+    report = extractor.report()
+    report.update({'full_lines_per_sec': round(len(lines) / full_seconds),
+                   'cached_lines_per_sec': round(len(lines) / cached_seconds),
+                   'speedup': round(full_seconds / cached_seconds, 2)})
+    print(report)
+    return report
+
+
+if __name__ == "__main__":
+    import os
+
+    if os.path.exists('weather_logs.txt'):
+        extractor = TemplateExtractor()
+        with open('weather_logs.txt', encoding='utf-8') as f:
+            extractor.extract_lines(f)
+        print(f"✅ weather_logs.txt: {extractor.report()}")
+    benchmark_templates()
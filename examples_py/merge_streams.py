@@ -0,0 +1,72 @@
+# merge_streams.py - Date-Ordered K-Way Merge of Normalized City Streams
+"""
+Lazy k-way merge of per-source normalized record streams.
+
+Each source (one city / station file) is already ordered by date, so the
+combined (date, city)-ordered output can be produced with a heap holding one
+record per source instead of a global O(N log N) sort over everything.
+Memory is O(number of sources), independent of the number of records.
+Records without a date count as later than every dated record, so each
+source may end with its undated records and they come last in the output.
+"""
+
+import csv
+import heapq
+
+COLUMNS = ['city', 'date', 'max', 'min', 'precip', 'wind', 'humidity']
+
+
+def merge_key(record):
+    """(date, city) sort key; records without a date sort last, a missing city first"""
+    date = record.get('date')
+    return (not date, date or '', record.get('city') or '')
+
+
+def _checked(stream, name):
+    """Pass records through, raising if the stream is not date-ordered"""
+    previous = None
+    for record in stream:
+        key = merge_key(record)
+        if previous is not None and key < previous:
+            raise ValueError(
+                f"Source '{name}' is not date-ordered: {key[1] or 'no date'} after {previous[1] or 'no date'}"
+            )
+        previous = key
+        yield record
+
+
+def merge_sorted_streams(streams, check_order=True):
+    """
+    Merge date-ordered record streams into one (date, city)-ordered generator.
+
+    streams - iterables of normalized record dicts (lists, generators, readers)
+    check_order - validate each stream's order while merging
+    """
+    if check_order:
+        streams = [_checked(stream, i) for i, stream in enumerate(streams)]
+    return heapq.merge(*streams, key=merge_key)
+
+
+def iter_csv_records(filename):
+    """Stream normalized records from a per-source CSV file, one row at a time"""
+    with open(filename, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def write_sorted_csv(streams, filename='cities_comparison.csv', check_order=True):
+    """
+    Write the merged, sorted output row by row.
+
+    Only the current head record of each stream is held in memory.
+    Returns: number of rows written
+    """
+    count = 0
+    with open(filename, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for record in merge_sorted_streams(streams, check_order=check_order):
+            writer.writerow(record)
+            count += 1
+    print(f"Merged {count} records into {filename}")
+    return count
@@ -12,12 +12,19 @@ from examples_py.normalize_tokyo import normalize_tokyo_data
 from examples_py.normalize_newyork import normalize_newyork_data  
 from examples_py.normalize_london import normalize_london_data
 
-def load_and_normalize_all_cities():
+def load_and_normalize_all_cities(compact=False, date_format='datetime64',
+                                  dedupe=None, source_priority=None):
     """
     Load and normalize weather data from all cities
+    compact: store city as category, date as datetime64/int32 days,
+             measurements as float32 and humidity as UInt8 (see compact_dtypes.py)
+    dedupe: None or a conflict strategy ('last', 'priority', 'completeness')
+            for duplicate (city, date) rows (see deduplicate.py)
+    source_priority: source file names, highest priority first (dedupe='priority')
     Returns: Combined DataFrame
     """
     all_data = []
+    sources = []
     
     # Tokyo
     try:
@@ -25,6 +32,7 @@ def load_and_normalize_all_cities():
             tokyo_data = json.load(f)
         tokyo_normalized = normalize_tokyo_data(tokyo_data)
         all_data.extend(tokyo_normalized)
+        sources.append(('tokyo_weather.json', tokyo_normalized))
         print(f"✅ Tokyo: {len(tokyo_normalized)} records")
     except Exception as e:
         print(f"❌ Tokyo failed: {e}")
@@ -35,6 +43,7 @@ def load_and_normalize_all_cities():
             newyork_data = json.load(f)
         newyork_normalized = normalize_newyork_data(newyork_data)
         all_data.extend(newyork_normalized)
+        sources.append(('newyork_weather.json', newyork_normalized))
         print(f"✅ New York: {len(newyork_normalized)} records")
     except Exception as e:
         print(f"❌ New York failed: {e}")
@@ -45,10 +54,18 @@ def load_and_normalize_all_cities():
             london_data = json.load(f)
         london_normalized = normalize_london_data(london_data)
         all_data.extend(london_normalized)
+        sources.append(('london_weather.json', london_normalized))
         print(f"✅ London: {len(london_normalized)} records")
     except Exception as e:
         print(f"❌ London failed: {e}")
     
+    if dedupe:
+        from examples_py.deduplicate import deduplicate_records, tag_sources
+        all_data, stats = deduplicate_records(tag_sources(sources), strategy=dedupe,
+                                              source_priority=source_priority)
+        print(f"🔁 Dedup ({dedupe}): {stats['duplicates']} duplicates, "
+              f"{stats['replaced']} rows replaced")
+    
     # Convert to DataFrame
     df = pd.DataFrame(all_data)
     
@@ -56,9 +73,21 @@ def load_and_normalize_all_cities():
     columns = ['city', 'date', 'max', 'min', 'precip', 'wind', 'humidity']
     df = df[columns]
     
+    if compact:
+        from examples_py.compact_dtypes import compact_weather_frame
+        df = compact_weather_frame(df, date_format=date_format)
+    
     return df
 
 if __name__ == "__main__":
     df = load_and_normalize_all_cities()
     df.to_csv('cities_comparison.csv', index=False)
-    print(f"Saved {len(df)} records to cities_comparison.csv")
\ No newline at end of file
+    print(f"Saved {len(df)} records to cities_comparison.csv")
+
+    # Replace the touched partitions of the Parquet store (CSV above stays for compatibility)
+    try:
+        from examples_py.parquet_store import write_parquet_dataset, DEFAULT_ROOT
+        written = write_parquet_dataset(df, DEFAULT_ROOT, mode='overwrite')
+        print(f"Saved {written} records to {DEFAULT_ROOT}/")
+    except ImportError as e:
+        print(f"Parquet store skipped: {e}")
\ No newline at end of file
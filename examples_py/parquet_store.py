@@ -0,0 +1,187 @@
+# parquet_store.py - Partitioned Parquet Store for Combined Weather Data
+"""
+Partitioned Parquet dataset for the combined cities_comparison output.
+
+Layout (hive partitioning):
+    cities_comparison_parquet/city=Tokyo/year_month=2024-08/part-<id>.parquet
+
+Appending writes new files into the matching partitions only, so old
+partitions are never rewritten. Appends are not idempotent: appending the
+same (city, date) twice stores it twice; use mode='overwrite' to replace
+the partitions of a re-run. Reads prune partitions by city / month
+and only load the requested columns.
+
+Rows whose date is missing or not a valid YYYY-MM-DD (e.g. New York's
+swapped '2024-15-08') are kept in a year_month=invalid partition with a null
+date and the original text in `raw_date`; reads return that text as the
+date, so the store holds the same rows as the CSV. Measurement dtypes of
+the input are kept (float32 / UInt8 from compact_dtypes stay narrow).
+"""
+
+import os
+import uuid
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow is optional, CSV export still works without it
+    pa = None
+
+DEFAULT_ROOT = 'cities_comparison_parquet'
+COLUMNS = ['city', 'date', 'max', 'min', 'precip', 'wind', 'humidity']
+MEASUREMENT_COLUMNS = ['max', 'min', 'precip', 'wind', 'humidity']
+PARTITION_COLS = ['city', 'year_month']
+INVALID_PARTITION = 'invalid'
+EPOCH = pd.Timestamp('1970-01-01')
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the Parquet store: pip install pyarrow")
+
+
+def _measurement_type(series):
+    """Arrow type for a measurement column, keeping narrow numeric input dtypes"""
+    dtype = getattr(series.dtype, 'numpy_dtype', series.dtype)   # UInt8 -> uint8
+    return pa.from_numpy_dtype(dtype) if pd.api.types.is_numeric_dtype(dtype) else pa.float64()
+
+
+def _parse_dates(series):
+    """Date column (ISO strings, datetime64 or day numbers) -> datetime64 Series, NaT if invalid"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return pd.to_datetime(series)
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return EPOCH + pd.to_timedelta(series.astype('float64'), unit='D')
+    return pd.to_datetime(series, format='%Y-%m-%d', errors='coerce')
+
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([('city', pa.string()), ('year_month', pa.string())]),
+        flavor='hive'
+    )
+
+
+def _to_table(data):
+    """Convert records or a DataFrame into a typed Arrow table with partition columns"""
+    df = pd.DataFrame(data).reindex(columns=COLUMNS)
+
+    # Rows without a valid date go to the 'invalid' partition, keeping the original text
+    dates = _parse_dates(df['date'])
+    invalid = dates.isna()
+    if invalid.any():
+        print(f"⚠️ {int(invalid.sum())} rows with missing/invalid dates stored "
+              f"in year_month={INVALID_PARTITION}")
+
+    out = pd.DataFrame({'city': df['city'].astype(object).where(df['city'].notna(), None)})
+    out['date'] = dates.dt.date.where(~invalid, None)
+    out['raw_date'] = df['date'].astype(object).where(invalid & df['date'].notna(), None)
+    fields = [('date', pa.date32()), ('raw_date', pa.string())]
+    for col in MEASUREMENT_COLUMNS:
+        series = df[col]
+        if not pd.api.types.is_numeric_dtype(series.dtype):
+            series = pd.to_numeric(series, errors='coerce')
+        out[col] = series
+        fields.append((col, _measurement_type(series)))
+    out['year_month'] = dates.dt.strftime('%Y-%m').where(~invalid, INVALID_PARTITION)
+
+    schema = pa.schema(fields + [('city', pa.string()), ('year_month', pa.string())])
+    return pa.Table.from_pandas(out, schema=schema, preserve_index=False)
+
+
+def write_parquet_dataset(data, root=DEFAULT_ROOT, mode='append'):
+    """
+    Write combined weather records to the partitioned dataset.
+
+    mode='append'    - add new files to the touched partitions, keep everything else
+                       (rows are not deduplicated: re-appending a day duplicates it)
+    mode='overwrite' - replace only the partitions present in `data`
+    Returns: number of rows written
+    """
+    _require_pyarrow()
+    if mode not in ('append', 'overwrite'):
+        raise ValueError(f"Unknown mode: {mode}")
+
+    table = _to_table(data)
+    if table.num_rows == 0:
+        return 0
+
+    ds.write_dataset(
+        table,
+        root,
+        format='parquet',
+        partitioning=_partitioning(),
+        # Unique basename per write so appends never clobber existing files
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior=('overwrite_or_ignore' if mode == 'append'
+                                else 'delete_matching'),
+    )
+    return table.num_rows
+
+
+def read_parquet_dataset(root=DEFAULT_ROOT, cities=None, months=None,
+                         start_date=None, end_date=None, columns=None):
+    """
+    Read the dataset with partition pruning and column projection.
+
+    cities / months - lists of partition values to keep (None = all)
+    start_date / end_date - inclusive ISO dates, months outside the range are pruned
+    columns - subset of COLUMNS to load (None = all)
+    Returns: DataFrame sorted by city and date
+    """
+    _require_pyarrow()
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=columns or COLUMNS)
+
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+    # Files written from different input dtypes (or before raw_date existed) are unified
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if schemas:
+        schema = pa.unify_schemas(schemas + [_partitioning().schema], promote_options='permissive')
+        dataset = ds.dataset(root, format='parquet', partitioning=_partitioning(), schema=schema)
+
+    expr = None
+
+    def _and(a, b):
+        return b if a is None else a & b
+
+    if cities:
+        expr = _and(expr, ds.field('city').isin(list(cities)))
+    if months:
+        expr = _and(expr, ds.field('year_month').isin(list(months)))
+    if start_date:
+        expr = _and(expr, ds.field('year_month') >= start_date[:7])
+        expr = _and(expr, ds.field('date') >= pa.scalar(pd.Timestamp(start_date).date()))
+    if end_date:
+        expr = _and(expr, ds.field('year_month') <= end_date[:7])
+        expr = _and(expr, ds.field('date') <= pa.scalar(pd.Timestamp(end_date).date()))
+
+    wanted = list(columns) if columns else list(COLUMNS)
+    unknown = [c for c in wanted if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+
+    load = list(wanted)
+    if 'date' in wanted and 'raw_date' in dataset.schema.names:
+        load.append('raw_date')
+    table = dataset.to_table(columns=load, filter=expr)
+    df = table.to_pandas()
+
+    if 'date' in df.columns:
+        dates = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        if 'raw_date' in df.columns:
+            dates = dates.where(dates.notna(), df.pop('raw_date'))
+        df['date'] = dates.astype(object).where(dates.notna(), None)
+    sort_cols = [c for c in ['city', 'date'] if c in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols, kind='stable').reset_index(drop=True)
+    return df[wanted]
+
+
+def export_csv(root=DEFAULT_ROOT, filename='cities_comparison.csv', **filters):
+    """Export the dataset (or a filtered slice of it) to the legacy CSV format"""
+    df = read_parquet_dataset(root, **filters)
+    df.to_csv(filename, index=False)
+    print(f"Exported {len(df)} records to {filename}")
+    return df
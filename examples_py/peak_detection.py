@@ -0,0 +1,255 @@
+# peak_detection.py - Vectorized Peak-Hour Detection over Flat Hourly Data
+"""
+Vectorized replacement for find_peak_hours_buggy (Task E, example5.py).
+
+Works on a flat hourly table (one row per hour: date, time, temperature,
+optionally station), such as the one written by hourly_table.py.
+
+Rows get an integer group code per (station, date). The per-group maximum
+is a single np.maximum.at pass, and the peak row is the first row in its
+group holding that maximum (grouped argmax). Top-k repeats this k times,
+masking the rows already chosen. The data is never sorted as a whole (only
+np.unique over the run keys and over each rank's candidate rows) and there
+is no Python loop over rows or groups.
+
+Missing data is explicit in the result (peak_time None, peak_temp NaN):
+    status 'ok'                   - peak found
+    status 'empty'                - the group has fewer valid temperatures than this rank
+    status 'no_valid_temperature' - the group has hours, but every temperature is None/NaN
+    status 'no_hours'             - an expected group with no rows at all (see `expected`)
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def group_codes(df, by):
+    """
+    Integer code per row for the groups in columns `by` (first-appearance order).
+
+    Runs of equal keys are found first, so already sorted/contiguous data
+    (e.g. the hourly table, one run per day) only factorizes one key per run.
+    Returns: (codes int64 array, DataFrame of group keys indexed by code)
+    """
+    by = list(by)
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), df[by].iloc[:0].reset_index(drop=True)
+
+    change = np.zeros(n, dtype=bool)
+    change[0] = True
+    for col in by:
+        values = df[col].to_numpy()
+        change[1:] |= values[1:] != values[:-1]
+
+    starts = np.flatnonzero(change)
+    run_keys = df[by].iloc[starts].reset_index(drop=True)
+    run_group = run_keys.groupby(by, sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+
+    codes = run_group[np.cumsum(change) - 1]
+    _, first_run = np.unique(run_group, return_index=True)
+    return codes, run_keys.iloc[first_run].reset_index(drop=True)
+
+
+def grouped_top_k(values, codes, n_groups, k=1):
+    """
+    Row indices of the k largest values per group (ties: earliest row first).
+    NaN values are never chosen.
+    Returns: (rows, peaks) - (n_groups x k) arrays; row -1 / NaN where a group
+             has fewer than k valid values
+    """
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(float)
+    codes = np.asarray(codes, dtype=np.int64)
+
+    work = np.where(np.isnan(values), -np.inf, values)
+    rows = np.full((n_groups, k), -1, dtype=np.int64)
+
+    for rank in range(k):
+        best = np.full(n_groups, -np.inf, dtype=work.dtype)
+        np.maximum.at(best, codes, work)
+
+        hit = np.flatnonzero(work == best[codes])
+        hit = hit[work[hit] > -np.inf]          # groups with nothing left
+        groups, first = np.unique(codes[hit], return_index=True)
+        chosen = hit[first]
+        rows[groups, rank] = chosen
+        work[chosen] = -np.inf                  # exclude from the next rank
+
+    peaks = np.full((n_groups, k), np.nan)
+    found = rows >= 0
+    peaks[found] = values[rows[found]]
+    return rows, peaks
+
+
+def _float_values(column):
+    """Float array with NaN for None/NA; float32/float64 columns are not copied"""
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f':
+        return column.to_numpy()
+    return pd.to_numeric(column, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _rank_status(found, valid_hours, hours):
+    """Status per (group, rank) cell from the grouped_top_k rows found"""
+    group_status = np.where(hours > 0, 'no_valid_temperature', 'no_hours')
+    group_status = np.where(valid_hours > 0, 'empty', group_status)
+    return np.where(found, 'ok', group_status[:, None])
+
+
+def find_peak_hours(df, by=('date',), time_col='time', value_col='temperature', k=1,
+                    expected=None):
+    """
+    Peak hour(s) per group of a flat hourly DataFrame.
+
+    by       - group columns, e.g. ('date',) or ('station', 'date')
+    k        - number of peak hours per group (rank 1 = hottest)
+    expected - optional DataFrame/list of group keys that must appear in the
+               result; those without rows get status 'no_hours'
+    Returns: DataFrame with the group columns, rank, peak_time, peak_temp,
+             hours, valid_hours and status (k rows per group)
+    """
+    by = list(by)
+    codes, keys = group_codes(df, by)
+    n_groups = len(keys)
+
+    values = _float_values(df[value_col])
+    rows, peaks = grouped_top_k(values, codes, n_groups, k)
+
+    hours = np.bincount(codes, minlength=n_groups)
+    valid_hours = np.bincount(codes, weights=~np.isnan(values), minlength=n_groups).astype(np.int64)
+
+    times = df[time_col].to_numpy()
+    found = rows >= 0
+    peak_time = np.full(rows.shape, None, dtype=object)
+    peak_time[found] = times[rows[found]]
+
+    result = keys.loc[np.repeat(np.arange(n_groups), k)].reset_index(drop=True)
+    result['rank'] = np.tile(np.arange(1, k + 1), n_groups)
+    result['peak_time'] = pd.Series(peak_time.ravel(), dtype=object)   # keep None, not NaN
+    result['peak_temp'] = peaks.ravel()
+    result['hours'] = np.repeat(hours, k)
+    result['valid_hours'] = np.repeat(valid_hours, k)
+    result['status'] = _rank_status(found, valid_hours, hours).ravel()
+
+    if expected is not None:
+        result = _add_expected_groups(result, expected, by, k)
+    return result
+
+
+def _add_expected_groups(result, expected, by, k):
+    expected = pd.DataFrame(expected, columns=by) if not isinstance(expected, pd.DataFrame) \
+        else expected[by]
+    missing = expected.merge(result[by].drop_duplicates(), on=by, how='left', indicator=True)
+    missing = missing.loc[missing['_merge'] == 'left_only', by].reset_index(drop=True)
+    if missing.empty:
+        return result
+
+    extra = missing.loc[np.repeat(np.arange(len(missing)), k)].reset_index(drop=True)
+    extra['rank'] = np.tile(np.arange(1, k + 1), len(missing))
+    extra['peak_time'] = None
+    extra['peak_temp'] = np.nan
+    extra['hours'] = 0
+    extra['valid_hours'] = 0
+    extra['status'] = 'no_hours'
+    return pd.concat([result, extra], ignore_index=True)
+
+
+def peak_hours_from_table(table, k=1):
+    """
+    Peak hours per day straight from an opened hourly_table.HourlyTable.
+    The day index gives the group codes, so days without rows appear with
+    status 'no_hours'.
+    """
+    from examples_py.hourly_table import minutes_to_time
+
+    df = table.to_pandas()
+    n_days = len(table.dates)
+    hours = np.diff(table.offsets)
+    codes = np.repeat(np.arange(n_days), hours)
+    values = df['temperature'].to_numpy(dtype=float)
+    rows, peaks = grouped_top_k(values, codes, n_days, k)
+
+    valid_hours = np.bincount(codes, weights=~np.isnan(values), minlength=n_days).astype(np.int64)
+    minutes = df['minutes'].to_numpy()
+    found = rows >= 0
+    peak_minutes = np.full(rows.shape, np.nan)
+    peak_minutes[found] = minutes[rows[found]]
+
+    return pd.DataFrame({
+        'date': np.repeat(table.dates, k),
+        'rank': np.tile(np.arange(1, k + 1), n_days),
+        'peak_time': pd.Series(minutes_to_time(peak_minutes.ravel()), dtype=object),
+        'peak_temp': peaks.ravel(),
+        'hours': np.repeat(hours, k),
+        'valid_hours': np.repeat(valid_hours, k),
+        'status': _rank_status(found, valid_hours, hours).ravel(),
+    })
+
+
+# --- Checks and benchmark ---------------------------------------------------
+
+def synthetic_hourly(n_rows, hours_per_day=24, n_stations=1, missing_fraction=0.05, seed=0):
+    """Flat (station, date, minutes, temperature) frame sorted by station and date"""
+    rng = np.random.default_rng(seed)
+    per_station = -(-n_rows // n_stations)
+    n_days = -(-per_station // hours_per_day)
+    step = 24 * 60 // hours_per_day
+
+    day = np.tile(np.repeat(np.arange(n_days, dtype=np.int64), hours_per_day)[:per_station], n_stations)[:n_rows]
+    minutes = np.tile((np.arange(hours_per_day) * step).astype(np.uint16), n_days * n_stations)[:n_rows]
+    temps = (20 + 8 * np.sin(2 * np.pi * minutes / 1440 - np.pi / 2)
+             + rng.normal(0, 2, n_rows)).astype(np.float32)
+    temps[rng.random(n_rows) < missing_fraction] = np.nan
+
+    return pd.DataFrame({
+        'station': np.repeat(np.arange(n_stations, dtype=np.int32), per_station)[:n_rows],
+        'date': (np.datetime64('2000-01-01', 'D') + day).astype('datetime64[s]'),
+        'minutes': minutes,
+        'temperature': temps,
+    })
+
+
+def check_against_pandas(n_rows=200_000, n_stations=7, seed=0):
+    """
+    Compare rank-1 peaks with a pandas groupby idxmax reference (shuffled rows).
+    Returns: number of groups checked. Raises AssertionError on mismatch.
+    """
+    df = synthetic_hourly(n_rows, n_stations=n_stations, seed=seed)
+    df.loc[df['date'] == df['date'].iloc[0], 'temperature'] = np.nan   # all-NaN day
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    ours = find_peak_hours(df, by=('station', 'date'), time_col='minutes')
+    grouped = df.groupby(['station', 'date'], sort=False)['temperature']
+    ref_rows = grouped.apply(lambda s: s.index[s.to_numpy() == s.max()].min() if s.notna().any() else -1)
+
+    merged = ours.merge(ref_rows.rename('ref_row').reset_index(), on=['station', 'date'])
+    ok = merged['ref_row'] >= 0
+    assert (merged.loc[~ok, 'status'] == 'no_valid_temperature').all()
+    assert (merged.loc[ok, 'peak_temp'].to_numpy()
+            == df['temperature'].to_numpy()[merged.loc[ok, 'ref_row']]).all()
+    assert (merged.loc[ok, 'peak_time'].to_numpy().astype(int)
+            == df['minutes'].to_numpy()[merged.loc[ok, 'ref_row']]).all()
+    return len(merged)
+
+
+def benchmark_peaks(n_rows=10_000_000, n_stations=100, k=3, seed=0):
+    """Time rank-1 and top-k peak detection per (station, date) on synthetic data"""
+    df = synthetic_hourly(n_rows, n_stations=n_stations, seed=seed)
+    report = {'rows': n_rows}
+    for top in sorted({1, k}):
+        start = time.perf_counter()
+        result = find_peak_hours(df, by=('station', 'date'), time_col='minutes', k=top)
+        seconds = time.perf_counter() - start
+        report[f'top{top}_seconds'] = round(seconds, 2)
+        report[f'top{top}_rows_per_sec'] = round(n_rows / seconds)
+    report['groups'] = len(result) // k
+    print(report)
+    return report
+
+
+if __name__ == "__main__":
+    print(f"✅ {check_against_pandas()} groups match pandas groupby idxmax")
+    benchmark_peaks()
@@ -0,0 +1,307 @@
+# weather_extract.py - Fused Single-Pass Extractor for Free-Text Weather Logs
+"""
+Replacement engine for extract_weather_data_buggy (Task F, example6.py).
+
+All patterns are compiled once into a single scanner regex with one named
+group per token kind:
+
+    dates    - 2024-08-18, 2024/08/25, 20/08/2024, 23.08.2024, 24-Aug-2024
+               (month-name dates such as "August 19, 2024" / "Aug 22 '24" are
+               completed from the numbers that follow the month word)
+    keywords - max/min temperature, humidity and precipitation labels in
+               English, Spanish and Norwegian (Máximo, Høy, Humedad, Nedbør, H=, P=...)
+    numbers  - with optional unit (°F, F, °C, C, %, mm, millimeters) and
+               comma or dot decimals
+
+Each line is scanned once with findall; words are mapped to fields through
+a cached dict, so a label costs one lookup after its first occurrence. A
+label arms its field and the next number fills it, so fields are assigned
+as the scan goes, in whatever order the line uses.
+
+Temperatures are returned in °C (°F converted). Unitless temperatures are
+judged once per line: if any of them is above 60, all of them are °F, so
+"Max 61 Min 40" is 16.11 / 4.44 °C rather than a minimum above the maximum.
+Dates are returned as ISO 'YYYY-MM-DD', humidity in % and
+precipitation in mm.
+"""
+
+import datetime
+import os
+import re
+import time
+
+MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+               'august', 'september', 'october', 'november', 'december']
+FIELDS = ('date', 'max_temp', 'min_temp', 'humidity', 'precipitation')
+FAHRENHEIT_THRESHOLD = 60
+
+# One scanner for every token kind; findall returns (date, value, unit, word) per token.
+# Only numeric dates are matched here: month names arrive as words and the
+# following numbers (day, year) complete the date.
+SCANNER = re.compile(
+    r"""
+      (?P<date>\d{4}[-/]\d\d?[-/]\d\d?
+             | \d\d?[/.]\d\d?[/.]\d{4}
+             | \d\d?-[^\W\d_]{3,9}\.?-\d{4})
+    | (?P<value>-?\d+(?:[.,]\d+)?)(?:\s*(?P<unit>°\s*[CcFf]\b|[CcFf]\b|%|mm\b|millimet))?
+    | (?P<word>[^\W\d_]+=?)
+    """,
+    re.VERBOSE,
+)
+
+# Label prefixes (lower case) -> field, plus short labels matched exactly
+KEYWORDS = [
+    (('max', 'máx', 'high', 'høy', 'top'), 'max_temp'),
+    (('min', 'mín', 'low', 'lav', 'bottom'), 'min_temp'),
+    (('hum', 'fuktighet'), 'humidity'),
+    (('rain', 'precip', 'nedbør'), 'precipitation'),
+]
+SHORT_LABELS = {'h=': 'humidity', 'p=': 'precipitation', 'rh': 'humidity', 'rh=': 'humidity'}
+
+# Field slots used while scanning (index into FIELDS); month words get MONTH + month number
+DATE, MAX_TEMP, MIN_TEMP, HUMIDITY, PRECIPITATION = range(5)
+MONTH, NO_FIELD = 5, -1
+_SLOTS = {name: i for i, name in enumerate(FIELDS)}
+
+# Caches: the vocabulary and the dates of log files repeat a lot
+_word_slots = {}    # raw word -> slot
+_dates = {}         # numeric date token -> ISO date
+CACHE_LIMIT = 100_000
+
+
+def month_number(word):
+    """'Aug' / 'August' / 'sept.' -> 8 / 8 / 9, None if not a month name"""
+    lower = word.lower().rstrip('.')
+    if len(lower) < 3:
+        return None
+    for number, name in enumerate(MONTH_NAMES, 1):
+        if name.startswith(lower) or (lower == 'sept' and number == 9):
+            return number
+    return None
+
+
+def word_field(word):
+    """Field labelled by a word ('Máximo' -> 'max_temp', 'H=' -> 'humidity', 'Aug' -> 'month', else '')"""
+    lower = word.lower()
+    field = SHORT_LABELS.get(lower)
+    if field is None:
+        stem = lower.rstrip('=')
+        field = next((name for prefixes, name in KEYWORDS if stem.startswith(prefixes)), '')
+    if not field and month_number(word):
+        field = 'month'
+    return field
+
+
+def _word_slot(word):
+    field = word_field(word)
+    slot = MONTH + month_number(word) if field == 'month' else _SLOTS.get(field, NO_FIELD)
+    if len(_word_slots) > CACHE_LIMIT:
+        _word_slots.clear()
+    _word_slots[word] = slot
+    return slot
+
+
+def _iso(year, month, day):
+    if year < 100:
+        year += 2000
+    if not datetime.MINYEAR <= year <= datetime.MAXYEAR:
+        return None                     # e.g. a 13-digit id read as a year
+    try:
+        return datetime.date(year, month, day).isoformat()
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def parse_date(text):
+    """Numeric date token (or DD-Mon-YYYY) -> 'YYYY-MM-DD', None if not a real date"""
+    parts = re.split(r'[-/.]', text)
+    if len(parts[0]) == 4:
+        return _iso(int(parts[0]), int(parts[1]), int(parts[2]))
+    month = int(parts[1]) if parts[1].isdigit() else month_number(parts[1])
+    return _iso(int(parts[2]), month, int(parts[0]))
+
+
+def _date_token(text):
+    date = _dates.get(text)
+    if date is None:
+        date = parse_date(text) or ''
+        if len(_dates) > CACHE_LIMIT:
+            _dates.clear()
+        _dates[text] = date
+    return date or None
+
+
+def _celsius(fahrenheit):
+    return round((fahrenheit - 32) * 5 / 9, 2)
+
+
+def _unitless_to_celsius(values, slots):
+    """Convert the unitless temperatures of one line together: all °F if any is above the threshold"""
+    if any(values[slot] > FAHRENHEIT_THRESHOLD for slot in slots):
+        for slot in slots:
+            values[slot] = _celsius(values[slot])
+
+
+def scan_tokens(tokens, sources=None):
+    """
+    Field values from scanner tokens ((date, value, unit, word) tuples).
+    sources: optional list of 5, filled with the index of the token that set
+    each field (a (month word, day, year) tuple for month-name dates).
+    Returns: list of 5 values in FIELDS order
+    """
+    values = [None] * 5
+    pending = NO_FIELD
+    slots = _word_slots
+    month = day = None
+    unitless = []       # temperature slots without a unit, decided after the scan
+
+    for i, (date, value, unit, word) in enumerate(tokens):
+        if word:
+            slot = slots.get(word)
+            if slot is None:
+                slot = _word_slot(word)
+            if slot >= MONTH:
+                if values[DATE] is None:
+                    pending, month, day, month_at = MONTH, slot - MONTH, None, i
+            elif slot != NO_FIELD:
+                pending = slot
+        elif value:
+            if pending == NO_FIELD:
+                continue
+            if pending == MONTH:
+                # "August 19, 2024" / "Aug 22 '24": day, then year
+                if day is None and value.isdigit() and int(value) <= 31:
+                    day, day_at = int(value), i
+                    continue
+                if day is not None and value.isdigit():
+                    values[DATE] = _iso(int(value), month, day)
+                    if sources is not None:
+                        sources[DATE] = (month_at, day_at, i)
+            elif values[pending] is None:
+                number = float(value.replace(',', '.'))
+                if pending == MAX_TEMP or pending == MIN_TEMP:
+                    if not unit:
+                        unitless.append(pending)
+                    elif unit[-1] in 'Ff':
+                        number = _celsius(number)
+                values[pending] = number
+                if sources is not None:
+                    sources[pending] = i
+            pending = NO_FIELD
+        elif values[DATE] is None:
+            values[DATE] = _date_token(date)
+            if sources is not None:
+                sources[DATE] = i
+
+    if unitless:
+        _unitless_to_celsius(values, unitless)
+    return values
+
+
+def extract_weather_fields(line):
+    """
+    Single scan of one log line.
+    Returns: dict with date, max_temp, min_temp, humidity, precipitation (None if absent)
+    """
+    return dict(zip(FIELDS, scan_tokens(SCANNER.findall(line))))
+
+
+def extract_lines(lines):
+    """Extract every non-empty line. Returns: list of result dicts"""
+    return [extract_weather_fields(line) for line in lines if line.strip()]
+
+
+# --- Benchmark --------------------------------------------------------------
+
+SAMPLE_FORMATS = [
+    "{iso}: Máximo {hf}°F, mínimo {lf}°F, humedad {h}%, precipitación {pc}mm",
+    "{long} - High: {hf}F Low: {lf}F Humidity: {h}% Rain: {p}mm",
+    "{dmy} Max temp: {hcc}°C Min: {lcc}°C Humid: {h}% Precip: {p}",
+    "{iso} Maximum temperature {hf}°F minimum {lf}°F humidity {h}% precipitation {pc} millimeters",
+    "{short}: TOP {hc}°C BOTTOM {lc}°C H={h}% P={p}mm",
+    "{dotted} - Høy: {hf}°F Lav: {lf}°F Fuktighet: {h}% Nedbør: {pc}mm",
+    "{dmon}: Max {hc}C Min {lc}C Humidity {h}% Rain {p}mm",
+    "{slash} High temp {hf}°F Low temp {lf}°F RH {h}% Precipitation {pc}mm",
+]
+
+
+def generate_log_corpus(path, n_lines, seed=0):
+    """Write n_lines log lines cycling through the Task F formats with random values"""
+    import random
+
+    rng = random.Random(seed)
+    start = datetime.date(2000, 1, 1)
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        for i in range(n_lines):
+            d = start + datetime.timedelta(days=i % 9000)
+            hc = rng.uniform(15, 40)
+            lc = hc - rng.uniform(3, 12)
+            p = rng.uniform(0, 20)
+            f.write(SAMPLE_FORMATS[i % len(SAMPLE_FORMATS)].format(
+                iso=d.isoformat(), slash=d.strftime('%Y/%m/%d'), dmy=d.strftime('%d/%m/%Y'),
+                dotted=d.strftime('%d.%m.%Y'), dmon=d.strftime('%d-%b-%Y'),
+                long=d.strftime('%B %d, %Y'), short=d.strftime("%b %d '%y"),
+                hf=round(hc * 9 / 5 + 32), lf=round(lc * 9 / 5 + 32),
+                hc=f"{hc:.1f}", lc=f"{lc:.1f}",
+                hcc=f"{hc:.1f}".replace('.', ','), lcc=f"{lc:.1f}".replace('.', ','),
+                h=rng.randint(20, 99), p=f"{p:.1f}", pc=f"{p:.1f}".replace('.', ','),
+            ))
+            f.write('\n')
+
+
+def check_sample_lines():
+    """The eight example6 sample lines (plus unit edge cases) with their expected values. Returns: number checked"""
+    lines = [
+        "2024-08-18: Máximo 87°F, mínimo 72°F, humedad 65%, precipitación 0,0mm",
+        "August 19, 2024 - High: 91F Low: 75F Humidity: 72% Rain: 2.5mm",
+        "20/08/2024 Max temp: 32,9°C Min: 22,5°C Humid: 58% Precip: 0.0",
+        "2024-08-21 Maximum temperature 89°F minimum 74°F humidity 68% precipitation 1,2 millimeters",
+        "Aug 22 '24: TOP 35.1°C BOTTOM 25.7°C H=63% P=0mm",
+        "23.08.2024 - Høy: 88°F Lav: 71°F Fuktighet: 59% Nedbør: 0,5mm",
+        "24-Aug-2024: Max 33.8C Min 24.1C Humidity 61% Rain 0.0mm",
+        "2024/08/25 High temp 90°F Low temp 73°F RH 66% Precipitation 3,1mm",
+    ]
+    expected = [
+        ('2024-08-18', 30.56, 22.22, 65.0, 0.0), ('2024-08-19', 32.78, 23.89, 72.0, 2.5),
+        ('2024-08-20', 32.9, 22.5, 58.0, 0.0), ('2024-08-21', 31.67, 23.33, 68.0, 1.2),
+        ('2024-08-22', 35.1, 25.7, 63.0, 0.0), ('2024-08-23', 31.11, 21.67, 59.0, 0.5),
+        ('2024-08-24', 33.8, 24.1, 61.0, 0.0), ('2024-08-25', 32.22, 22.78, 66.0, 3.1),
+    ]
+    # Unitless temperatures share one unit per line
+    lines += ["2024-08-26 Max 61 Min 40", "2024-08-27 Max 30 Min 20", "2024-08-28 Max 88 Min 21C"]
+    expected += [('2024-08-26', 16.11, 4.44, None, None), ('2024-08-27', 30.0, 20.0, None, None),
+                 ('2024-08-28', 31.11, 21.0, None, None)]
+    # A long number after a month name is not a year
+    lines.append("May 3 reading id 1693555200000 Max 30C")
+    expected.append((None, 30.0, None, None, None))
+    for line, values in zip(lines, expected):
+        result = extract_weather_fields(line)
+        assert tuple(result[f] for f in FIELDS) == values, (line, result)
+    return len(lines)
+
+
+def benchmark_extraction(n_lines=500_000, path='weather_logs_benchmark.txt', keep_file=False):
+    """Lines/sec of the fused scanner vs extract_weather_data_buggy on a generated corpus"""
+    from examples_py.example6 import extract_weather_data_buggy
+
+    generate_log_corpus(path, n_lines)
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    report = {'lines': len(lines)}
+    for name, func in [('buggy', extract_weather_data_buggy), ('fused', extract_weather_fields)]:
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        seconds = time.perf_counter() - start
+        report[f'{name}_lines_per_sec'] = round(len(lines) / seconds)
+    report['speedup'] = round(report['fused_lines_per_sec'] / report['buggy_lines_per_sec'], 2)
+    print(report)
+    if not keep_file:
+        os.remove(path)
+    return report
+
+
+if __name__ == "__main__":
+    print(f"✅ {check_sample_lines()} sample lines extracted correctly")
+    benchmark_extraction()
@@ -0,0 +1,190 @@
+# xml_batch.py - Process-Pool Parsing of Many Station XML Files
+"""
+Batch mode for Task E when data arrives as one XML file per station per day.
+
+Files are distributed over a process pool (files are handed out in chunks
+to keep inter-process overhead low). Each worker parses one file with
+xml_streaming.iter_days and returns compact columns instead of nested
+dicts:
+
+    date         datetime64[s]
+    minutes      uint16 (minutes since midnight, 65535 = missing/invalid time)
+    temperature  float32
+    wind_speed   float32
+
+The parent concatenates the columns, adds the station, and sorts once by
+(station, date, minutes). Files that fail to parse or contain no hours are
+listed in a per-file report instead of stopping the batch.
+"""
+
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from examples_py.hourly_table import time_to_minutes
+from examples_py.xml_streaming import generate_hourly_xml, iter_days
+
+MISSING_MINUTES = np.iinfo(np.uint16).max
+
+
+def station_from_path(path):
+    """Default station id: file name up to the first underscore ('KJFK_2024-08-18.xml' -> 'KJFK')"""
+    return os.path.basename(path).split('_', 1)[0].rsplit('.', 1)[0]
+
+
+def parse_file_columnar(path):
+    """
+    Parse one hourly XML file into columns.
+    Returns: dict of numpy arrays (date, minutes, temperature, wind_speed)
+    """
+    dates, minutes = [], array('H')
+    temps, winds = array('f'), array('f')
+    nan = float('nan')
+
+    for day in iter_days(path):
+        hourly = day['hourly']
+        dates.extend([day['date']] * len(hourly))
+        for hour in hourly:
+            m = time_to_minutes(hour['time'])
+            minutes.append(MISSING_MINUTES if m is None else m)
+            temps.append(nan if hour['temperature'] is None else hour['temperature'])
+            winds.append(nan if hour['wind_speed'] is None else hour['wind_speed'])
+
+    return {
+        'date': pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce').to_numpy('datetime64[s]'),
+        'minutes': np.frombuffer(minutes, dtype=np.uint16),
+        'temperature': np.frombuffer(temps, dtype=np.float32),
+        'wind_speed': np.frombuffer(winds, dtype=np.float32),
+    }
+
+
+def _parse_job(path):
+    """Worker entry point: never raises, so one bad file cannot stop the pool"""
+    start = time.perf_counter()
+    try:
+        columns = parse_file_columnar(path)
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return path, columns, None, time.perf_counter() - start
+
+
+def parse_xml_batch(paths, workers=None, station_of=station_from_path, chunksize=None):
+    """
+    Parse many hourly XML files in parallel.
+
+    workers    - pool size (default os.cpu_count()); 1 parses in-process
+    station_of - path -> station id
+    Returns: (DataFrame sorted by station/date/minutes, report DataFrame with
+             one row per file: path, station, rows, status, error, seconds)
+    """
+    paths = [str(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 8))
+
+    if workers == 1:
+        results = map(_parse_job, paths)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_parse_job, paths, chunksize=chunksize)
+
+    parts, stations, report = [], [], []
+    try:
+        for path, columns, error, seconds in results:
+            station = station_of(path)
+            rows = 0 if columns is None else len(columns['minutes'])
+            status = 'error' if error else ('empty' if rows == 0 else 'ok')
+            report.append({'path': path, 'station': station, 'rows': rows, 'status': status,
+                           'error': error, 'seconds': round(seconds, 4)})
+            if rows:
+                parts.append(columns)
+                stations.append((station, rows))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return _merge_parts(parts, stations), pd.DataFrame(report)
+
+
+def _merge_parts(parts, stations):
+    if not parts:
+        return pd.DataFrame({'station': pd.Categorical([]),
+                             'date': np.array([], dtype='datetime64[s]'),
+                             'minutes': np.array([], dtype=np.uint16),
+                             'temperature': np.array([], dtype=np.float32),
+                             'wind_speed': np.array([], dtype=np.float32)})
+
+    names = sorted({s for s, _ in stations}, key=str)
+    code_of = {s: i for i, s in enumerate(names)}
+    station_codes = np.repeat(np.array([code_of[s] for s, _ in stations], dtype=np.int32),
+                              [rows for _, rows in stations])
+    columns = {name: np.concatenate([p[name] for p in parts])
+               for name in ('date', 'minutes', 'temperature', 'wind_speed')}
+
+    order = np.lexsort((columns['minutes'], columns['date'], station_codes))
+    return pd.DataFrame({
+        'station': pd.Categorical.from_codes(station_codes[order], categories=names),
+        **{name: values[order] for name, values in columns.items()},
+    })
+
+
+# --- Benchmark --------------------------------------------------------------
+
+def generate_station_files(directory, n_stations=50, n_days=40, hours_per_day=24, n_corrupt=2):
+    """
+    Write one XML file per station per day ('<station>_<date>.xml') into `directory`.
+    The first `n_corrupt` files are truncated to exercise the error report.
+    Returns: list of paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    first_day = np.datetime64('2024-01-01', 'D')
+    paths = []
+    for s in range(n_stations):
+        for d in range(n_days):
+            date = str(first_day + d)
+            path = os.path.join(directory, f"ST{s:04d}_{date}.xml")
+            generate_hourly_xml(path, n_days=1, hours_per_day=hours_per_day,
+                                seed=s * n_days + d, start_date=date)
+            paths.append(path)
+
+    for path in paths[:n_corrupt]:
+        with open(path, 'r+', encoding='utf-8') as f:
+            f.truncate(200)
+    return sorted(paths)
+
+
+def benchmark_batch(directory='xml_batch_benchmark', n_stations=50, n_days=40, worker_counts=None):
+    """
+    Parse generated per-station-per-day files with increasing pool sizes.
+    Returns: list of report dicts (files/sec and speedup over 1 worker)
+    """
+    paths = generate_station_files(directory, n_stations=n_stations, n_days=n_days)
+    cpus = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+
+    results, baseline = [], None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        data, report = parse_xml_batch(paths, workers=workers)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        row = {'workers': workers, 'files': len(paths), 'rows': len(data),
+               'errors': int((report['status'] == 'error').sum()),
+               'seconds': round(seconds, 2), 'files_per_sec': round(len(paths) / seconds),
+               'speedup': round(baseline / seconds, 2)}
+        print(row)
+        results.append(row)
+
+    for path in paths:
+        os.remove(path)
+    os.rmdir(directory)
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_batch()
@@ -0,0 +1,186 @@
+# xml_config.py - Namespace-Resolved Parser Configuration for Hourly Weather XML
+"""
+Configurable Task E parser without hard-coded Clark-notation strings.
+
+XMLParserConfig describes the document by local names (day, hour, the hour
+fields and their output keys). While parsing, the namespace declarations
+are read from the document root and the config is compiled into plain
+dict/set lookups of full '{uri}local' tags:
+
+    {'{http://weather.example.com/schema}temp': 'temperature',
+     '{http://weather.example.com/schema}wind': 'wind_speed', ...}
+
+Every <hour> is then read in one pass over its children (one dict lookup per
+child) instead of one find() per field. Fields can be pinned to a namespace
+prefix or URI (field_namespaces={'temp': 'w'}); unpinned fields match any
+namespace declared in the document, or no namespace. A declaration below the
+root (xmlns:x on a <day>) extends the lookups, which are recompiled before
+the next element is handled.
+
+lxml is used automatically when installed (backend='auto', the default);
+backend='etree' forces the standard library and backend='lxml' requires lxml.
+"""
+
+import time
+import xml.etree.ElementTree as ET
+
+from examples_py.xml_streaming import _to_float
+
+
+def get_backend(backend='auto'):
+    """'auto' | 'lxml' | 'etree' -> (name, etree module)"""
+    if backend in ('auto', 'lxml'):
+        try:
+            from lxml import etree
+            return 'lxml', etree
+        except ImportError:
+            if backend == 'lxml':
+                raise ImportError("The lxml backend requires lxml: pip install lxml") from None
+    return 'etree', ET
+
+
+class CompiledLookup:
+    """Tag lookups for one document, built from its root namespace map"""
+
+    def __init__(self, day_tags, hour_tags, field_tags, namespaces):
+        self.day_tags = day_tags        # set of full day tags
+        self.hour_tags = hour_tags      # set of full hour tags
+        self.field_tags = field_tags    # full child tag -> output key
+        self.namespaces = namespaces    # prefix -> URI (the last declaration of each prefix)
+
+
+class XMLParserConfig:
+    """Local names of the hourly weather layout, plus optional namespace pins"""
+
+    def __init__(self, day='day', hour='hour', fields=None, field_namespaces=None,
+                 date_attr='date', time_attr='time', backend='auto'):
+        self.day = day
+        self.hour = hour
+        self.fields = fields or {'temp': 'temperature', 'wind': 'wind_speed'}  # local name -> key
+        self.field_namespaces = field_namespaces or {}   # local name -> prefix or URI
+        self.date_attr = date_attr
+        self.time_attr = time_attr
+        self.backend = backend
+
+    def compile(self, namespaces):
+        """Namespace declarations (prefix -> URI dict or (prefix, URI) pairs) -> CompiledLookup"""
+        pairs = list(namespaces.items() if isinstance(namespaces, dict) else namespaces)
+        uris = {uri for _, uri in pairs} | {''}
+
+        def tags(local, pin=None):
+            if pin is not None:
+                # A prefix may be bound to different URIs in different parts of the document
+                allowed = {uri for prefix, uri in pairs if prefix == pin} or {pin}
+            else:
+                allowed = uris
+            return {f'{{{uri}}}{local}' if uri else local for uri in allowed}
+
+        field_tags = {}
+        for local, key in self.fields.items():
+            for tag in tags(local, self.field_namespaces.get(local)):
+                field_tags[tag] = key
+        return CompiledLookup(
+            tags(self.day, self.field_namespaces.get(self.day)),
+            tags(self.hour, self.field_namespaces.get(self.hour)),
+            field_tags,
+            dict(pairs),
+        )
+
+
+def read_hour(hour, lookup, keys, time_attr='time'):
+    """One pass over the children of an <hour> element"""
+    record = {'time': hour.get(time_attr), **dict.fromkeys(keys)}
+    field_tags = lookup.field_tags
+    for child in hour:
+        key = field_tags.get(child.tag)
+        if key is not None:
+            record[key] = _to_float(child.text)
+    return record
+
+
+def iter_days_config(source, config=None, skip_undated=True):
+    """
+    Yield {'date', 'hourly': [{'time', <field keys>...}]} records like
+    xml_streaming.iter_days, using the compiled namespace lookups.
+    """
+    config = config or XMLParserConfig()
+    backend, etree = get_backend(config.backend)
+    keys = list(config.fields.values())
+
+    if backend == 'lxml':
+        # lxml filters element events in C: only <day> ends reach Python
+        events = etree.iterparse(source, events=('start-ns', 'end'), tag=f'{{*}}{config.day}')
+    else:
+        events = ET.iterparse(source, events=('start-ns', 'start', 'end'))
+    declared, lookup, root = [], None, None
+
+    for event, item in events:
+        if event == 'start-ns':
+            prefix, uri = item
+            if (prefix or '', uri) not in declared:
+                declared.append((prefix or '', uri))
+                lookup = None           # recompile before the next element
+            continue
+        if lookup is None:
+            lookup = config.compile(declared)
+        if event == 'start':
+            if root is None:
+                root = item
+            continue
+
+        if item.tag not in lookup.day_tags:
+            continue
+
+        date = item.get(config.date_attr)
+        if date or not skip_undated:
+            hourly = [read_hour(hour, lookup, keys, config.time_attr)
+                      for hour in item if hour.tag in lookup.hour_tags]
+            yield {'date': date, 'hourly': hourly}
+
+        item.clear()
+        if backend == 'lxml':
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+        else:
+            root.clear()
+
+
+def parse_xml_config(source, config=None):
+    """List version of iter_days_config (same output shape as parse_xml_buggy)"""
+    return list(iter_days_config(source, config))
+
+
+def benchmark_config(size_mb=20, path='hourly_config_benchmark.xml', repeats=3):
+    """Local-name matching (xml_streaming.iter_days) vs compiled lookups, per backend"""
+    import os
+    from examples_py.xml_streaming import generate_hourly_xml, parse_xml_streaming
+
+    generate_hourly_xml(path, target_mb=size_mb)
+    runs = [('local_name', lambda: parse_xml_streaming(path)),
+            ('compiled_etree', lambda: parse_xml_config(path, XMLParserConfig(backend='etree')))]
+    if get_backend('auto')[0] == 'lxml':
+        runs.append(('compiled_lxml', lambda: parse_xml_config(path, XMLParserConfig(backend='lxml'))))
+
+    report, expected = {'file_mb': round(os.path.getsize(path) / 1e6, 1)}, None
+    for name, func in runs:
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        expected = expected if expected is not None else result
+        assert result == expected, name
+        report[f'{name}_s'] = round(best, 2)
+    print(report)
+    os.remove(path)
+    return report
+
+
+if __name__ == "__main__":
+    import os
+
+    if os.path.exists('hourly_weather.xml'):
+        days = parse_xml_config('hourly_weather.xml')
+        print(f"✅ Parsed {len(days)} days with the {get_backend(XMLParserConfig().backend)[0]} backend")
+    benchmark_config()
@@ -0,0 +1,373 @@
+# xml_streaming.py - Constant-Memory Streaming Parser for Hourly Weather XML
+"""
+Streaming replacement for parse_xml_buggy (Task E, example5.py).
+
+iter_days() walks the document with ElementTree.iterparse and yields one day
+record at a time:
+
+    {'date': '2024-08-18', 'hourly': [{'time': '00:00', 'temperature': 22.1, 'wind_speed': 12.5}, ...]}
+
+After a <day> is processed the parsed elements are cleared from the root, so
+peak memory depends on the size of one day, not on the size of the file.
+Elements are matched by local name, so the default namespace, the `w:`
+prefix (or any other prefix/URI) and un-namespaced documents all work.
+
+iter_day_aggregates() is the fused parse-and-aggregate mode: per-day peak
+temperature and hour, min/mean temperature, max wind and hour counts are
+computed in expat callbacks while the XML streams past, without building
+Elements or hourly records (unless keep_hourly=True).
+"""
+
+import os
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+
+def local_name(tag):
+    """'{uri}temp' -> 'temp'"""
+    return tag.rpartition('}')[2]
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_hour(hour_elem):
+    """Read one <hour> element (time attribute + temp/wind children)"""
+    record = {'time': hour_elem.get('time'), 'temperature': None, 'wind_speed': None}
+    for child in hour_elem:
+        name = local_name(child.tag)
+        if name == 'temp':
+            record['temperature'] = _to_float(child.text)
+        elif name == 'wind':
+            record['wind_speed'] = _to_float(child.text)
+    return record
+
+
+def iter_days(source, skip_undated=True):
+    """
+    Yield day records from an hourly weather XML file or file object.
+
+    skip_undated: days without a `date` attribute are skipped (as in
+                  parse_xml_buggy); set False to yield them with date=None
+    """
+    context = ET.iterparse(source, events=('start', 'end'))
+    root = None
+
+    for event, elem in context:
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        if local_name(elem.tag) != 'day':
+            continue
+
+        date = elem.get('date')
+        if date or not skip_undated:
+            hourly = [parse_hour(hour) for hour in elem if local_name(hour.tag) == 'hour']
+            yield {'date': date, 'hourly': hourly}
+
+        # Drop everything parsed so far; the current day is no longer needed
+        elem.clear()
+        root.clear()
+
+
+def parse_xml_streaming(source):
+    """List version of iter_days with the same output as parse_xml_buggy"""
+    return list(iter_days(source))
+
+
+def aggregate_day(day):
+    """Aggregates of one day record from iter_days (the parse-then-aggregate path)"""
+    temps = [(h['temperature'], h['time']) for h in day['hourly'] if h['temperature'] is not None]
+    winds = [h['wind_speed'] for h in day['hourly'] if h['wind_speed'] is not None]
+    peak = max(temps, key=lambda t: t[0]) if temps else (None, None)
+    return {
+        'date': day['date'],
+        'peak_temp': peak[0],
+        'peak_hour': peak[1],
+        'min_temp': min(t for t, _ in temps) if temps else None,
+        'mean_temp': sum(t for t, _ in temps) / len(temps) if temps else None,
+        'max_wind': max(winds) if winds else None,
+        'hours': len(day['hourly']),
+        'temp_hours': len(temps),
+    }
+
+
+def iter_day_aggregates(source, keep_hourly=False, skip_undated=True, chunk_size=1 << 20):
+    """
+    Single pass over the XML yielding per-day aggregates:
+    date, peak_temp, peak_hour (first hour reaching the peak), min_temp,
+    mean_temp, max_wind, hours, temp_hours (hours with a temperature).
+    Days without hours or temperatures get None aggregates.
+    keep_hourly: also attach the day's hourly records under 'hourly'
+
+    Runs on expat start-tag callbacks only and builds no Element objects,
+    which is what makes it faster than iter_days + aggregate_day. Without
+    end tags the Task E layout is assumed: every <hour> belongs to the last
+    <day> opened, and the text of <temp>/<wind> runs up to the next start
+    tag (whitespace around the number is ignored). Elements are matched by
+    local name, as in iter_days.
+    """
+    parser = expat.ParserCreate()   # no namespace processing: 'w:temp' is split on ':'
+    parser.buffer_text = True
+    kinds = {}                      # tag -> local name, so each distinct tag is split only once
+    text = []
+    parser.CharacterDataHandler = text.append
+    records = []
+
+    in_day = in_hour = False
+    field = None                    # 'temp' / 'wind' whose text is being collected
+    date = peak = low = peak_hour = max_wind = time_ = temp = wind = hourly = None
+    total = 0.0
+    hours = temp_hours = 0
+
+    def end_hour():
+        nonlocal in_hour, peak, low, peak_hour, max_wind, total, hours, temp_hours
+        in_hour = False
+        hours += 1
+        if temp is not None:
+            temp_hours += 1
+            total += temp
+            if peak is None or temp > peak:
+                peak, peak_hour = temp, time_
+            if low is None or temp < low:
+                low = temp
+        if wind is not None and (max_wind is None or wind > max_wind):
+            max_wind = wind
+        if keep_hourly:
+            hourly.append({'time': time_, 'temperature': temp, 'wind_speed': wind})
+
+    def end_day():
+        nonlocal in_day
+        if in_hour:
+            end_hour()
+        in_day = False
+        record = {
+            'date': date,
+            'peak_temp': peak,
+            'peak_hour': peak_hour,
+            'min_temp': low,
+            'mean_temp': total / temp_hours if temp_hours else None,
+            'max_wind': max_wind,
+            'hours': hours,
+            'temp_hours': temp_hours,
+        }
+        if keep_hourly:
+            record['hourly'] = hourly
+        records.append(record)
+
+    def start(tag, attrs):
+        nonlocal in_day, in_hour, field, date, peak, low, peak_hour, max_wind, total
+        nonlocal hours, temp_hours, time_, temp, wind, hourly
+        if field is not None:
+            try:
+                value = float(''.join(text))
+            except ValueError:
+                value = None
+            if field == 'temp':
+                temp = value
+            else:
+                wind = value
+            field = None
+
+        kind = kinds.get(tag)
+        if kind is None:
+            kind = kinds[tag] = tag.rpartition(':')[2]
+        if kind == 'temp' or kind == 'wind':
+            if in_hour:
+                field = kind
+        elif kind == 'hour':
+            if in_hour:
+                end_hour()
+            if in_day:
+                in_hour = True
+                time_ = attrs.get('time')
+                temp = wind = None
+        elif kind == 'day':
+            if in_day:
+                end_day()
+            date = attrs.get('date')
+            if date or not skip_undated:
+                in_day = True
+                peak = low = peak_hour = max_wind = None
+                total = 0.0
+                hours = temp_hours = 0
+                hourly = [] if keep_hourly else None
+        text.clear()
+
+    parser.StartElementHandler = start
+
+    f = source if hasattr(source, 'read') else open(source, 'rb')
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            try:
+                parser.Parse(chunk, not chunk)
+            except expat.ExpatError as e:
+                # Same exception type as iter_days / ElementTree
+                error = ET.ParseError(f"{expat.ErrorString(e.code)}: line {e.lineno}, column {e.offset}")
+                error.code, error.position = e.code, (e.lineno, e.offset)
+                raise error from None
+            if not chunk:
+                break
+            # The last day stays open until the next <day> starts
+            yield from records
+            records.clear()
+    finally:
+        if f is not source:
+            f.close()
+
+    start('', {})                   # no tag of that name: only closes a pending <temp>/<wind>
+    if in_day:
+        end_day()
+    yield from records
+
+
+# --- Benchmark --------------------------------------------------------------
+
+def generate_hourly_xml(path, n_days=None, target_mb=None, hours_per_day=24, seed=0,
+                        start_date='1970-01-01'):
+    """
+    Write a synthetic hourly weather XML file in the Task E format.
+
+    Give either n_days or target_mb (approximate output size). The file is
+    written incrementally, so generating multi-GB files needs little memory.
+    Returns: number of days written
+    """
+    import datetime
+    import random
+
+    rng = random.Random(seed)
+    hour_xml = '        <hour time="{:02d}:{:02d}">\n            <w:temp>{:.1f}</w:temp>\n            <w:wind>{:.1f}</w:wind>\n        </hour>\n'
+    step = 24 * 60 // hours_per_day
+    approx_day_bytes = 32 + hours_per_day * len(hour_xml.format(0, 0, 20.0, 10.0))
+    if n_days is None:
+        n_days = max(1, int((target_mb or 1) * 1e6 / approx_day_bytes))
+
+    start = datetime.date.fromisoformat(start_date)
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<weather xmlns:w="http://weather.example.com/schema" '
+                'xmlns="http://weather.example.com/default">\n')
+        for d in range(n_days):
+            day = start + datetime.timedelta(days=d % 2_900_000)
+            parts = [f'    <day date="{day.isoformat()}">\n']
+            for h in range(hours_per_day):
+                minutes = h * step
+                parts.append(hour_xml.format(minutes // 60, minutes % 60,
+                                             rng.uniform(-5, 35), rng.uniform(0, 40)))
+            parts.append('    </day>\n')
+            f.write(''.join(parts))
+        f.write('</weather>\n')
+    return n_days
+
+
+def measure(func, *args, trace=True, **kwargs):
+    """
+    Run func and report (result, seconds, tracemalloc peak MB, max RSS MB).
+    tracemalloc slows parsing down; pass trace=False for pure timings.
+    Max RSS is None where the `resource` module is missing (Windows).
+    """
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if trace:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    try:
+        import resource
+    except ImportError:  # Unix only
+        rss_mb = None
+    else:
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result, seconds, peak_mb, rss_mb
+
+
+def benchmark_streaming(sizes_mb=(10, 100, 1000), path='hourly_benchmark.xml',
+                        trace=True, keep_files=False):
+    """
+    Stream generated files of increasing size and report peak memory.
+    Peak traced memory should stay flat as the file grows.
+    Returns: list of report dicts
+    """
+    def consume(p):
+        days = hours = 0
+        for day in iter_days(p):
+            days += 1
+            hours += len(day['hourly'])
+        return days, hours
+
+    results = []
+    for size in sizes_mb:
+        generate_hourly_xml(path, target_mb=size)
+        file_mb = os.path.getsize(path) / 1e6
+        (days, hours), seconds, peak_mb, rss_mb = measure(consume, path, trace=trace)
+        row = {'file_mb': round(file_mb, 1), 'days': days, 'hours': hours,
+               'seconds': round(seconds, 2), 'mb_per_sec': round(file_mb / seconds, 1),
+               'peak_traced_mb': round(peak_mb, 2) if peak_mb is not None else None,
+               'max_rss_mb': round(rss_mb, 1) if rss_mb is not None else None}
+        print(row)
+        results.append(row)
+        if not keep_files:
+            os.remove(path)
+    return results
+
+
+def benchmark_fused(size_mb=50, path='hourly_benchmark.xml', repeats=3, min_speedup=2.0,
+                    keep_file=False):
+    """
+    Compare fused aggregation with parse-then-aggregate on a generated file:
+      parse_then_aggregate - full list from parse_xml_streaming, then aggregate_day
+      fused                - iter_day_aggregates
+    Runs alternate and the best of `repeats` runs counts for each. Raises
+    AssertionError if the results differ or fused is less than
+    min_speedup times faster. Returns: report dict
+    """
+    generate_hourly_xml(path, target_mb=size_mb)
+    file_mb = os.path.getsize(path) / 1e6
+
+    def parse_then_aggregate():
+        return [aggregate_day(day) for day in parse_xml_streaming(path)]
+
+    def fused():
+        return list(iter_day_aggregates(path))
+
+    timings = {}
+    results = {}
+    for _ in range(repeats):
+        for name, func in [('parse_then_aggregate', parse_then_aggregate), ('fused', fused)]:
+            start = time.perf_counter()
+            results[name] = func()
+            elapsed = time.perf_counter() - start
+            timings[name] = min(elapsed, timings.get(name, elapsed))
+
+    if not keep_file:
+        os.remove(path)
+    assert results['fused'] == results['parse_then_aggregate'], "fused aggregates differ"
+    speedup = timings['parse_then_aggregate'] / timings['fused']
+    report = {
+        'file_mb': round(file_mb, 1),
+        'days': len(results['fused']),
+        'parse_then_aggregate_s': round(timings['parse_then_aggregate'], 2),
+        'fused_s': round(timings['fused'], 2),
+        'fused_mb_per_sec': round(file_mb / timings['fused'], 1),
+        'speedup': round(speedup, 2),
+    }
+    print(report)
+    assert speedup >= min_speedup, f"fused is only {speedup:.2f}x faster (expected {min_speedup}x)"
+    return report
+
+
+if __name__ == "__main__":
+    benchmark_streaming()
+    benchmark_fused()